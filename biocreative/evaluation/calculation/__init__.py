@@ -7,3 +7,18 @@ Created by Florian Leitner on 2009-10-21.
 Copyright (c) 2009 CNIO. All rights reserved.
 License: GNU Public License, latest version.
 """
+
+from biocreative.evaluation import class_loader
+from biocreative.evaluation.settings import Evaluate
+
+def bootstrap_factory(evaluation_type):
+    if evaluation_type == Evaluate.ACT:
+        return class_loader("ArticleBootstrap")
+    else:
+        return class_loader("ProteinBootstrap")
+    
+def randomization_factory(evaluation_type):
+    if evaluation_type == Evaluate.ACT:
+        return class_loader("ArticleRandomization")
+    else:
+        return class_loader("ProteinRandomization")
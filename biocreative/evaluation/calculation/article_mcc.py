@@ -5,6 +5,13 @@ from biocreative.evaluation.calculation.evaluation import AbstractEvaluation
 class ArticleMccEvaluation(AbstractEvaluation):
     "Implementation for the ACT MCC and Accuracy evaluation."
     
+    def __init__(self, *args, **kwds):
+        super(ArticleMccEvaluation, self).__init__(*args, **kwds)
+        # the (results, GS) classification vectors if evaluated from them
+        self.vectors = None
+        self.dois = None # the DOIs of the articles in the vectors
+        self.articles = None # the number of articles in the GS
+    
     def evaluate(self, result_item, std_item, cutoff):
         """Count hits according to the classification in the results vs. the
         annotation in the GS.
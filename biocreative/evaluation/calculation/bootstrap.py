@@ -0,0 +1,343 @@
+import logging
+import random
+
+from itertools import imap, izip
+from math import ceil, floor
+
+from biocreative.evaluation.calculation.article_mcc import ArticleMccEvaluation
+from biocreative.evaluation.calculation.hits import Hits
+from biocreative.evaluation.calculation.protein_evaluation import \
+    ProteinEvaluation
+from biocreative.evaluation.parallel import fork_map, shared_state
+
+LEVEL = 0.95 # default confidence level of the intervals
+CHUNK_SIZE = 100 # replicates per worker task, each with its own seed
+
+def percentile_interval(values, level=LEVEL):
+    """Return the (lower, upper) percentiles of the values enclosing the
+    given level, or (None, None) if there are no values.
+    """
+    if not values:
+        return None, None
+    
+    values = sorted(values)
+    last = len(values) - 1
+    tail = (1.0 - level) / 2.0
+    return (
+        values[int(floor(tail * last))],
+        values[int(ceil((1.0 - tail) * last))]
+    )
+
+def _replicate_chunk(chunk):
+    "Return the scores of a chunk of replicates of the shared bootstrap."
+    return shared_state().replicates(*chunk)
+
+
+class AbstractBootstrap(object):
+    """Bootstrap confidence intervals for the scores of an evaluation.
+    
+    The evaluated documents are resampled (with replacement) as a vector
+    of weights, i.e., the number of times each document was drawn, and
+    the scores are calculated from the weighted hit counts and relevance
+    vectors the evaluation already has.
+    """
+    
+    SCORES = () # names of the scores, as set by the implementing classes
+    
+    def __init__(self, documents):
+        self.documents = documents # number of documents to resample
+        self.logger = logging.getLogger("AbstractBootstrap")
+    
+    def intervals(self, replicates, jobs=1, level=LEVEL):
+        """Return a list of (score name, lower, upper) percentile intervals
+        at the confidence level for all SCORES, from the given number of
+        replicates, using up to jobs worker processes.
+        
+        The replicates are drawn in chunks with fixed random seeds, so the
+        intervals do not depend on the number of jobs.
+        """
+        samples = [[] for name in self.SCORES]
+        
+        if not self.documents:
+            self.logger.warning("no documents to resample")
+            replicates = 0
+        
+        chunks = [
+            (seed, min(CHUNK_SIZE, replicates - start))
+            for seed, start in enumerate(xrange(0, replicates, CHUNK_SIZE))
+        ]
+        
+        for scores_list in fork_map(_replicate_chunk, chunks, jobs, self):
+            for scores in scores_list:
+                for sample, value in izip(samples, scores):
+                    if value is not None:
+                        sample.append(value)
+        
+        self.logger.info("calculated %i bootstrap replicates" % replicates)
+        return [
+            (name,) + percentile_interval(sample, level)
+            for name, sample in izip(self.SCORES, samples)
+        ]
+    
+    def replicates(self, seed, size):
+        "Return the scores of size replicates drawn with the random seed."
+        draw = random.Random(seed).random
+        documents = self.documents
+        scores = []
+        
+        for replicate in xrange(size):
+            weights = [0] * documents
+            
+            for i in xrange(documents):
+                weights[int(draw() * documents)] += 1
+            
+            scores.append(self.scores(weights))
+        
+        return scores
+    
+    def scores(self, weights):
+        """Return the SCORES of a replicate given the document weights.
+        
+        Abstract method.
+        """
+        raise NotImplementedError('abstract')
+    
+    @staticmethod
+    def _divide(denominator, divisor):
+        """Division result if divisor is not 0, otherwise return 0."""
+        if divisor == 0.0:
+            return 0.0
+        
+        return denominator / divisor
+    
+
+class ProteinBootstrap(AbstractBootstrap):
+    """Bootstrap for INT and IPT evaluations, resampling the documents of
+    the macro-averaged evaluation using their relevance lists (see
+    ProteinEvaluator).
+    
+    The P/R curves of a replicate are counted up rank by rank from the
+    hits and the documents running out of results at each rank, so a
+    replicate takes time proportional to the number of hits, documents,
+    and ranks.
+    """
+    
+    SCORES = (
+        'macro_precision', 'macro_recall', 'macro_f_score', 'macro_avrg_p',
+        'macro_fap_score', 'micro_precision', 'micro_recall',
+        'micro_f_score', 'micro_avrg_p', 'micro_fap_score',
+    )
+    
+    def __init__(self, micro, macro):
+        docs = macro.values()
+        super(ProteinBootstrap, self).__init__(len(docs))
+        self.logger = logging.getLogger("ProteinBootstrap")
+        assert all(doc.relevance is not None for doc in docs), \
+            "no relevance lists in the macro evaluation"
+        self.gs_sizes = [doc.hits.tp + doc.hits.fn for doc in docs]
+        self.tps = [doc.hits.tp for doc in docs]
+        self.sizes = [len(doc.relevance) for doc in docs]
+        self.precisions = [doc.precision for doc in docs]
+        self.recalls = [doc.recall for doc in docs]
+        self.f_scores = [doc.f_score for doc in docs]
+        self.max_rank = max(self.sizes) if docs else 0
+        # the documents with a hit at, and running out of results at, a rank
+        self.hits_at = [[] for rank in xrange(self.max_rank)]
+        self.ending_at = [[] for rank in xrange(self.max_rank + 1)]
+        
+        for i, doc in enumerate(docs):
+            for rank, hit in enumerate(doc.relevance):
+                if hit:
+                    self.hits_at[rank].append(i)
+            
+            self.ending_at[self.sizes[i]].append(i)
+    
+    def scores(self, weights):
+        """Return the SCORES of a replicate given the document weights."""
+        divide = self._divide
+        num_docs = float(sum(weights))
+        tps, gs_sizes = self.tps, self.gs_sizes
+        gs_total = sum(w * n for w, n in izip(weights, gs_sizes))
+        active = sum(weights) - sum(weights[i] for i in self.ending_at[0])
+        tp_total = evaluated = 0
+        active_tps = 0 # weighted TPs of the documents still evaluated
+        ended_precisions = 0.0 # weighted precisions of the other documents
+        recall_sum = 0.0
+        micro_ap = _AvrgPrecision()
+        macro_ap = _AvrgPrecision()
+        
+        for rank in xrange(self.max_rank):
+            if rank:
+                for i in self.ending_at[rank]:
+                    active -= weights[i]
+                    active_tps -= weights[i] * tps[i]
+                    ended_precisions += weights[i] * tps[i] / float(rank)
+            
+            for i in self.hits_at[rank]:
+                tp_total += weights[i]
+                active_tps += weights[i]
+                recall_sum += weights[i] / float(gs_sizes[i])
+            
+            evaluated += active
+            micro_ap.add(
+                divide(tp_total, float(gs_total)),
+                divide(tp_total, float(evaluated))
+            )
+            macro_ap.add(
+                recall_sum / num_docs,
+                (active_tps / float(rank + 1) + ended_precisions) / num_docs
+            )
+        
+        micro = ProteinEvaluation()
+        micro.hits = Hits(tp_total, evaluated - tp_total, gs_total - tp_total)
+        macro_p, macro_r, macro_f = [
+            sum(w * value for w, value in izip(weights, values)) / num_docs
+            for values in (self.precisions, self.recalls, self.f_scores)
+        ]
+        macro_avrg_p = macro_ap.score()
+        micro_f, micro_avrg_p = micro.f_score, micro_ap.score()
+        
+        if macro_f and macro_avrg_p:
+            macro_fap = 2.0 * macro_f * macro_avrg_p / \
+                (macro_f + macro_avrg_p)
+        else:
+            macro_fap = 0.0
+        
+        return (
+            macro_p, macro_r, macro_f, macro_avrg_p, macro_fap,
+            micro.precision, micro.recall, micro_f, micro_avrg_p,
+            divide(2.0 * micro_f * micro_avrg_p, micro_f + micro_avrg_p)
+        )
+    
+
+class ArticleBootstrap(AbstractBootstrap):
+    """Bootstrap for ACT evaluations, resampling the GS articles using the
+    classification vectors of the MCC evaluation (see ArticleEvaluator).
+    
+    The articles without results only add to the FN count of the P/R curve
+    if they are annotated as True in the GS.
+    """
+    
+    SCORES = (
+        'specificity', 'sensitivity', 'accuracy', 'mcc_score', 'p_at_full_r',
+        'auc_pr',
+    )
+    
+    def __init__(self, auc_pr, mcc):
+        assert mcc.vectors is not None, \
+            "no classification vectors in the MCC evaluation"
+        super(ArticleBootstrap, self).__init__(mcc.articles)
+        self.logger = logging.getLogger("ArticleBootstrap")
+        self.gold_standard = mcc.vectors[1]
+        evaluated = len(self.gold_standard)
+        # the indices of the TP, FP, FN, and TN articles
+        self.classified = ([], [], [], [])
+        
+        for i, (result, std) in enumerate(izip(*mcc.vectors)):
+            self.classified[2 * (not result) + (not std)].append(i)
+        
+        # the articles without results but True in the GS come next
+        missed = auc_pr.hits.tp + auc_pr.hits.fn - sum(self.gold_standard)
+        self.missed = xrange(evaluated, evaluated + missed)
+    
+    def scores(self, weights):
+        """Return the SCORES of a replicate given the article weights."""
+        weight_of = weights.__getitem__
+        tp, fp, fn, tn = [
+            sum(imap(weight_of, indices)) for indices in self.classified
+        ]
+        recall_divisor = float(tp + fn + sum(imap(weight_of, self.missed)))
+        divide = self._divide
+        auc_pr = _AucPr()
+        true_positives = evaluated = 0
+        
+        for weight, std_item in izip(weights, self.gold_standard):
+            if not weight:
+                continue
+            elif std_item:
+                for copy in xrange(weight):
+                    true_positives += 1
+                    evaluated += 1
+                    auc_pr.add(
+                        divide(true_positives, recall_divisor),
+                        true_positives / float(evaluated)
+                    )
+            else:
+                # only the precision drops, from the first to the last copy
+                recall = divide(true_positives, recall_divisor)
+                auc_pr.add(recall, true_positives / float(evaluated + 1))
+                evaluated += weight
+                auc_pr.add(recall, true_positives / float(evaluated))
+        
+        mcc = ArticleMccEvaluation()
+        mcc.hits = Hits(tp, fp, fn, tn)
+        p_at_full_r = auc_pr.max_p if auc_pr.recall == 1.0 else None
+        return (
+            mcc.specificity, mcc.sensitivity, mcc.accuracy, mcc.mcc_score,
+            p_at_full_r, auc_pr.score()
+        )
+    
+
+class _AvrgPrecision(object):
+    """Average precision of P/R points added by ascending recall, as
+    calculated by ProteinEvaluation.avrg_p.
+    """
+    
+    def __init__(self):
+        self.avrg_p = 0.0
+        self.last_r = 0.0
+        self.recall = None
+        self.max_p = None
+    
+    def add(self, recall, precision):
+        if recall != self.recall:
+            self._close()
+            self.recall, self.max_p = recall, precision
+        elif precision > self.max_p:
+            self.max_p = precision
+    
+    def score(self):
+        self._close()
+        return self.avrg_p
+    
+    def _close(self):
+        if self.recall is not None:
+            self.avrg_p += self.max_p * (self.recall - self.last_r)
+            self.last_r = self.recall
+            self.recall = None
+    
+
+class _AucPr(object):
+    """Area under the P/R curve of points added by ascending recall, as
+    calculated by ArticleAucPrEvaluation.auc_pr.
+    """
+    
+    def __init__(self):
+        self.auc = 0.0
+        self.last_r = 0.0
+        self.last_p = 1.0
+        self.recall = None
+        self.max_p = self.min_p = None
+    
+    def add(self, recall, precision):
+        if recall != self.recall:
+            self._close()
+            self.recall = recall
+            self.max_p = self.min_p = precision
+        elif precision > self.max_p:
+            self.max_p = precision
+        elif precision < self.min_p:
+            self.min_p = precision
+    
+    def score(self):
+        self._close()
+        return self.auc
+    
+    def _close(self):
+        if self.recall is not None:
+            self.auc += (self.max_p + self.last_p) / 2 * \
+                (self.recall - self.last_r)
+            self.last_r = self.recall
+            self.last_p = self.min_p
+            self.recall = None
+    
@@ -3,6 +3,11 @@ from biocreative.evaluation.calculation.evaluation import AbstractEvaluation
 class ProteinEvaluation(AbstractEvaluation):
     "Implementation for the INT and IPT evaluations providing F-score."
     
+    def __init__(self, *args, **kwds):
+        super(ProteinEvaluation, self).__init__(*args, **kwds)
+        # the relevance list of the results if evaluated from it
+        self.relevance = None
+    
     def evaluate(self, result_list, std_set, cutoff):
         """Iterate over a list of results for a document, comparing them to
         a set of GS items.
@@ -23,11 +28,22 @@ class ProteinEvaluation(AbstractEvaluation):
     def evaluate_item(self, result_item, std_set):
         """If the classification is in the GS set, increase TP and decrease
         FN, otherwise increase FP.
+        
+        The GS set is either a list of result containers or a frozen set of
+        the (raw) GS items, matched against the result container's item.
         """
-        assert isinstance(std_set, list), \
-            "GS items not a list (is %s)" % std_set.__class__.__name__
+        if isinstance(std_set, frozenset):
+            hit = result_item.item in std_set
+        else:
+            assert isinstance(std_set, list), \
+                "GS items not a list (is %s)" % std_set.__class__.__name__
+            hit = result_item in std_set
         
-        if result_item in std_set:
+        self.count_hit(hit)
+    
+    def count_hit(self, hit):
+        "If hit is True, increase TP and decrease FN, otherwise increase FP."
+        if hit:
             self.hits.tp += 1
             self.hits.fn -= 1
         else:
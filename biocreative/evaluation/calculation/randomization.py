@@ -0,0 +1,254 @@
+import logging
+import random
+
+from collections import defaultdict
+from itertools import izip
+
+from biocreative.evaluation.calculation.article_mcc import ArticleMccEvaluation
+from biocreative.evaluation.calculation.bootstrap import ProteinBootstrap
+from biocreative.evaluation.calculation.hits import Hits
+from biocreative.evaluation.parallel import fork_map, shared_state
+
+CHUNK_SIZE = 1000 # shuffles per worker task, each with its own seed
+EPSILON = 1e-12 # differences this close to the observed one are as large
+ABSENT = 4 # class of an ACT article without a result (after TP, FP, FN, TN)
+
+def _shuffle_chunk(chunk):
+    """Return the number of shuffles in a chunk of the shared randomization
+    test with differences at least as large as the observed ones.
+    """
+    return shared_state().shuffles(*chunk)
+
+
+class AbstractRandomization(object):
+    """Paired approximate randomization test for the differences between
+    the scores of two runs evaluated on the same documents.
+    
+    Each shuffle swaps the results of the two runs for every document with
+    a probability of 0.5 and scores the two shuffled runs. The p-value of
+    a score is the fraction of shuffles where the absolute difference is at
+    least as large as the observed one, counting the observed runs as one
+    of the shuffles.
+    """
+    
+    SCORES = () # names of the scores, as set by the implementing classes
+    
+    def __init__(self, documents):
+        self.documents = documents # number of paired documents
+        self.observed_differences = None
+        self.logger = logging.getLogger("AbstractRandomization")
+    
+    def p_values(self, shuffles, jobs=1):
+        """Return a list of (score name, first score, second score, p-value)
+        tuples for all SCORES, from the given number of shuffles, using up
+        to jobs worker processes.
+        
+        The shuffles are done in chunks with fixed random seeds, so the
+        p-values do not depend on the number of jobs.
+        """
+        first, second = self.observed()
+        self.observed_differences = [
+            abs(a - b) - EPSILON for a, b in izip(first, second)
+        ]
+        chunks = [
+            (seed, min(CHUNK_SIZE, shuffles - start))
+            for seed, start in enumerate(xrange(0, shuffles, CHUNK_SIZE))
+        ]
+        counts = [1] * len(self.SCORES) # the observed runs
+        
+        for chunk_counts in fork_map(_shuffle_chunk, chunks, jobs, self):
+            counts = [a + b for a, b in izip(counts, chunk_counts)]
+        
+        self.logger.info("compared %i shuffles of %i documents" % (
+            shuffles, self.documents
+        ))
+        return [
+            (name, a, b, count / float(shuffles + 1))
+            for name, a, b, count in izip(self.SCORES, first, second, counts)
+        ]
+    
+    def shuffles(self, seed, size):
+        """Return the number of size shuffles done with the random seed
+        with differences at least as large as the observed ones, per score.
+        """
+        rand = random.Random(seed)
+        counts = [0] * len(self.SCORES)
+        
+        for shuffle in xrange(size):
+            first, second = self.shuffle(rand)
+            
+            for i, a, b, observed in izip(
+                xrange(len(counts)), first, second, self.observed_differences
+            ):
+                if abs(a - b) >= observed:
+                    counts[i] += 1
+        
+        return counts
+    
+    def observed(self):
+        """Return the SCORES of the first and the second run.
+        
+        Abstract method.
+        """
+        raise NotImplementedError('abstract')
+    
+    def shuffle(self, rand):
+        """Return the SCORES of the first and the second run after swapping
+        their results for a random half of the documents.
+        
+        Abstract method.
+        """
+        raise NotImplementedError('abstract')
+    
+
+class ProteinRandomization(AbstractRandomization):
+    """Randomization test for INT and IPT runs, comparing the macro- and
+    micro-averaged F-score and Avrg. Precision.
+    
+    The documents of both runs are pooled in one ProteinBootstrap, so a
+    shuffled run is scored as the weight vector selecting one of the two
+    evaluations of each document (see ProteinBootstrap.scores).
+    """
+    
+    SCORES = (
+        'macro_f_score', 'macro_avrg_p', 'micro_f_score', 'micro_avrg_p'
+    )
+    
+    def __init__(self, first, second):
+        """The first and second run are given as the (micro, macro)
+        evaluations the evaluator returned.
+        """
+        first_docs, second_docs = first[1], second[1]
+        assert set(first_docs) == set(second_docs), \
+            "the runs were evaluated on different documents"
+        super(ProteinRandomization, self).__init__(len(first_docs))
+        self.logger = logging.getLogger("ProteinRandomization")
+        pooled = {}
+        
+        for run, docs in enumerate((first_docs, second_docs)):
+            for doi, doc in docs.iteritems():
+                pooled[run, doi] = doc
+        
+        position = dict((key, i) for i, key in enumerate(pooled.keys()))
+        dois = first_docs.keys()
+        self.first = [position[0, doi] for doi in dois]
+        self.second = [position[1, doi] for doi in dois]
+        self.pooled = ProteinBootstrap(None, pooled)
+        self.selected = [
+            ProteinBootstrap.SCORES.index(name) for name in self.SCORES
+        ]
+    
+    def observed(self):
+        "Return the SCORES of the first and the second run."
+        return self._scores(self.first), self._scores(self.second)
+    
+    def shuffle(self, rand):
+        """Return the SCORES of the first and the second run after swapping
+        their results for a random half of the documents.
+        """
+        draw = rand.random
+        first = []
+        second = []
+        
+        for a, b in izip(self.first, self.second):
+            if draw() < 0.5:
+                a, b = b, a
+            
+            first.append(a)
+            second.append(b)
+        
+        return self._scores(first), self._scores(second)
+    
+    def _scores(self, documents):
+        "Return the SCORES of the run made of the pooled documents."
+        weights = [0] * len(self.pooled.sizes)
+        
+        for i in documents:
+            weights[i] = 1
+        
+        scores = self.pooled.scores(weights)
+        return [scores[i] for i in self.selected]
+    
+
+class ArticleRandomization(AbstractRandomization):
+    """Randomization test for ACT runs, comparing the accuracy and MCC
+    score.
+    
+    Both scores only depend on the number of articles classified as TP,
+    FP, FN, and TN (or without a result). Articles classified alike in both
+    runs do not change when swapped, and the others are grouped by their
+    two classes; a shuffle only has to draw the number of swapped articles
+    in each group.
+    """
+    
+    SCORES = ('accuracy', 'mcc_score')
+    
+    def __init__(self, first, second):
+        """The first and second run are given as the (AUC P/R, MCC)
+        evaluations the evaluator returned.
+        """
+        first_classes, second_classes = [
+            self._classes(mcc) for auc_pr, mcc in (first, second)
+        ]
+        dois = set(first_classes) | set(second_classes)
+        super(ArticleRandomization, self).__init__(len(dois))
+        self.logger = logging.getLogger("ArticleRandomization")
+        self.alike = [0] * (ABSENT + 1) # articles per class in both runs
+        groups = defaultdict(int)
+        
+        for doi in dois:
+            a = first_classes.get(doi, ABSENT)
+            b = second_classes.get(doi, ABSENT)
+            
+            if a == b:
+                self.alike[a] += 1
+            else:
+                groups[a, b] += 1
+        
+        # ((first class, second class), articles) pairs
+        self.groups = sorted(groups.items())
+    
+    @staticmethod
+    def _classes(mcc):
+        "Return a dictionary of the class of each article the MCC evaluated."
+        assert mcc.vectors is not None and mcc.dois is not None, \
+            "no classification vectors in the MCC evaluation"
+        return dict(
+            (doi, 2 * (not result) + (not std))
+            for doi, result, std in izip(mcc.dois, *mcc.vectors)
+        )
+    
+    def observed(self):
+        "Return the SCORES of the first and the second run."
+        first = list(self.alike)
+        second = list(self.alike)
+        
+        for (a, b), articles in self.groups:
+            first[a] += articles
+            second[b] += articles
+        
+        return self._scores(first), self._scores(second)
+    
+    def shuffle(self, rand):
+        """Return the SCORES of the first and the second run after swapping
+        their results for a random half of the articles.
+        """
+        first = list(self.alike)
+        second = list(self.alike)
+        
+        for (a, b), articles in self.groups:
+            # the number of heads in as many coin flips as articles
+            swapped = bin(rand.getrandbits(articles)).count('1')
+            first[a] += articles - swapped
+            first[b] += swapped
+            second[b] += articles - swapped
+            second[a] += swapped
+        
+        return self._scores(first), self._scores(second)
+    
+    def _scores(self, counts):
+        "Return the SCORES given the number of articles per class."
+        mcc = ArticleMccEvaluation()
+        mcc.hits = Hits(*counts[:ABSENT])
+        return [mcc.accuracy, mcc.mcc_score]
+    
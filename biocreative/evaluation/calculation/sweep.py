@@ -0,0 +1,48 @@
+class SweepPoint(object):
+    """The scores of an INT/IPT evaluation at one point of a sweep, i.e., at
+    a cutoff rank or a minimum confidence.
+    
+    Stores the micro-averaged hits and the micro- and macro-averaged
+    precision, recall, F-score, and Avrg. Precision (or None if it was not
+    calculated) the evaluation with that cutoff or minimum confidence would
+    have.
+    """
+    
+    __slots__ = (
+        'limit', 'hits', 'micro_precision', 'micro_recall', 'micro_f_score',
+        'micro_avrg_p', 'macro_precision', 'macro_recall', 'macro_f_score',
+        'macro_avrg_p'
+    )
+    
+    def __init__(self, limit, hits, micro_scores, macro_scores):
+        """The micro and macro scores are (precision, recall, F-score,
+        Avrg. Precision) tuples.
+        """
+        self.limit = limit
+        self.hits = hits
+        self.micro_precision, self.micro_recall, self.micro_f_score, \
+            self.micro_avrg_p = micro_scores
+        self.macro_precision, self.macro_recall, self.macro_f_score, \
+            self.macro_avrg_p = macro_scores
+    
+    def scores(self):
+        "Return the macro- followed by the micro-averaged scores."
+        return (
+            self.macro_precision, self.macro_recall, self.macro_f_score,
+            self.macro_avrg_p, self.micro_precision, self.micro_recall,
+            self.micro_f_score, self.micro_avrg_p
+        )
+    
+    
+    @staticmethod
+    def best(sweep, score='macro_f_score'):
+        """Return the point of the sweep with the highest score (preferring
+        the higher limit on ties), or None if the sweep is empty.
+        """
+        if not sweep:
+            return None
+        
+        return max(sweep, key=lambda point: (
+            getattr(point, score), point.limit
+        ))
+    
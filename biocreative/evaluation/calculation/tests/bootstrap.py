@@ -0,0 +1,231 @@
+import random
+import unittest
+
+from mock import Mock
+
+from biocreative.evaluation.calculation.article_mcc import ArticleMccEvaluation
+from biocreative.evaluation.calculation.bootstrap import AbstractBootstrap, \
+    ArticleBootstrap, ProteinBootstrap, percentile_interval
+from biocreative.evaluation.container.article_dict import ArticleDataDict
+from biocreative.evaluation.container.protein_dict import ProteinDataDict
+from biocreative.evaluation.controller.article import ArticleEvaluator
+from biocreative.evaluation.controller.protein import ProteinEvaluator
+
+class BootstrapAssertions(unittest.TestCase):
+    
+    def assert_scores(self, received, expected):
+        self.assertEqual(len(received), len(expected))
+        
+        for value, expected_value in zip(received, expected):
+            if expected_value is None:
+                self.assertEqual(value, None)
+            else:
+                self.assertAlmostEqual(value, expected_value, 10)
+    
+
+class AbstractBootstrapTest(BootstrapAssertions):
+    
+    def setUp(self):
+        self.bootstrap = AbstractBootstrap(10)
+        self.logger_mock = self.bootstrap.logger = Mock()
+        self.bootstrap.SCORES = ('total', 'first')
+        self.bootstrap.scores = lambda weights: (
+            sum(weights), weights[0] or None
+        )
+    
+    def test_init_state(self):
+        self.assertEqual(self.bootstrap.documents, 10)
+    
+    def test_percentile_interval(self):
+        values = [float(i) for i in range(101)]
+        random.Random(1).shuffle(values)
+        self.assertEqual(percentile_interval(values), (2.0, 98.0))
+        self.assertEqual(percentile_interval(values, 0.5), (25.0, 75.0))
+        self.assertEqual(percentile_interval([0.5]), (0.5, 0.5))
+        self.assertEqual(percentile_interval([]), (None, None))
+    
+    def test_scores(self):
+        self.assertRaises(
+            NotImplementedError, AbstractBootstrap.scores, self.bootstrap, []
+        )
+    
+    def test_replicates(self):
+        scores = self.bootstrap.replicates(3, 20)
+        self.assertEqual(len(scores), 20)
+        self.assertEqual(set(total for total, first in scores), set([10]))
+        self.assertEqual(scores, self.bootstrap.replicates(3, 20))
+        self.assertNotEqual(scores, self.bootstrap.replicates(4, 20))
+    
+    def test_intervals(self):
+        intervals = self.bootstrap.intervals(250)
+        self.assertEqual(intervals[0], ('total', 10, 10))
+        name, lower, upper = intervals[1]
+        self.assertEqual(name, 'first')
+        self.assertTrue(1 <= lower <= upper)
+        self.assertEqual(intervals, self.bootstrap.intervals(250))
+    
+    def test_intervals_without_documents(self):
+        self.bootstrap.documents = 0
+        self.assertEqual(
+            self.bootstrap.intervals(10),
+            [('total', None, None), ('first', None, None)]
+        )
+        self.assertEqual(self.logger_mock.warning.call_count, 1)
+    
+
+class ProteinBootstrapTest(BootstrapAssertions):
+    
+    def setUp(self):
+        rand = random.Random(1)
+        self.gs_rows = [
+            ("d%i" % d, "p%i" % p, None, None)
+            for d in range(30) for p in range(rand.randint(1, 6))
+        ]
+        self.result_rows = [
+            ("d%i" % d, "p%i" % p, None, round(rand.random(), 2))
+            for d in range(30) for p in range(rand.randint(0, 12))
+        ]
+        self.micro, self.macro = self.evaluate()
+        self.bootstrap = ProteinBootstrap(self.micro, self.macro)
+    
+    def evaluate(self, excluded=()):
+        gold_standard = ProteinDataDict()
+        gold_standard.load_from(
+            row for row in self.gs_rows if row[0] not in excluded
+        )
+        results = ProteinDataDict()
+        results.load_from(
+            row for row in self.result_rows if row[0] not in excluded
+        )
+        results.add_entries_only_in(gold_standard)
+        return ProteinEvaluator(8).process(results, gold_standard)
+    
+    def expected_scores(self, micro, macro):
+        return (
+            macro.precision, macro.recall, macro.f_score, macro.avrg_p,
+            macro.fap_score, micro.precision, micro.recall, micro.f_score,
+            micro.avrg_p, micro.fap_score
+        )
+    
+    def test_init_state(self):
+        self.assertEqual(self.bootstrap.documents, 30)
+        self.assertEqual(self.bootstrap.max_rank, 8)
+        self.assertEqual(sum(self.bootstrap.tps), self.micro.hits.tp)
+    
+    def test_scores_of_all_documents(self):
+        expected = self.expected_scores(self.micro, self.macro)
+        self.assert_scores(self.bootstrap.scores([1] * 30), expected)
+        self.assert_scores(self.bootstrap.scores([2] * 30), expected)
+    
+    def test_scores_of_a_sample(self):
+        excluded = set(["d3", "d4", "d17"])
+        weights = [
+            0 if doc.doi in excluded else 1 for doc in self.macro.values()
+        ]
+        self.assert_scores(
+            self.bootstrap.scores(weights),
+            self.expected_scores(*self.evaluate(excluded))
+        )
+    
+    def test_intervals(self):
+        intervals = self.bootstrap.intervals(50)
+        expected = self.expected_scores(self.micro, self.macro)
+        self.assertEqual(
+            [name for name, lower, upper in intervals],
+            list(ProteinBootstrap.SCORES)
+        )
+        
+        for (name, lower, upper), value in zip(intervals, expected):
+            self.assertTrue(lower <= upper)
+            self.assertTrue(lower <= value + 0.1 and value - 0.1 <= upper)
+    
+    def test_no_relevance_lists(self):
+        evaluator = ProteinEvaluator(8)
+        evaluator.reference_loop = True
+        gold_standard = ProteinDataDict()
+        gold_standard.load_from(self.gs_rows)
+        results = ProteinDataDict()
+        results.load_from(self.result_rows)
+        results.add_entries_only_in(gold_standard)
+        micro, macro = evaluator.process(results, gold_standard)
+        self.assertRaises(AssertionError, ProteinBootstrap, micro, macro)
+    
+
+class ArticleBootstrapTest(BootstrapAssertions):
+    
+    def setUp(self):
+        rand = random.Random(1)
+        self.gs_rows = [
+            (doi, rand.random() < 0.3, None, None) for doi in range(200)
+        ]
+        self.result_rows = [
+            (doi, rand.random() < 0.4, None, round(rand.random(), 2))
+            for doi in range(200) if rand.random() < 0.9
+        ]
+        self.auc_pr, self.mcc = self.evaluate()
+        self.bootstrap = ArticleBootstrap(self.auc_pr, self.mcc)
+    
+    def evaluate(self, excluded=()):
+        gold_standard = ArticleDataDict()
+        gold_standard.load_from(
+            row for row in self.gs_rows if row[0] not in excluded
+        )
+        results = ArticleDataDict()
+        results.load_from(
+            row for row in self.result_rows if row[0] not in excluded
+        )
+        self.results = results
+        return ArticleEvaluator(0).process(results, gold_standard)
+    
+    def expected_scores(self, auc_pr, mcc):
+        return (
+            mcc.specificity, mcc.sensitivity, mcc.accuracy, mcc.mcc_score,
+            auc_pr.p_at_full_r, auc_pr.auc_pr
+        )
+    
+    def test_init_state(self):
+        self.assertEqual(self.bootstrap.documents, 200)
+        self.assertEqual(
+            [len(indices) for indices in self.bootstrap.classified],
+            [self.mcc.hits.tp, self.mcc.hits.fp, self.mcc.hits.fn,
+             self.mcc.hits.tn]
+        )
+        self.assertEqual(
+            len(self.bootstrap.missed),
+            self.auc_pr.hits.tp + self.auc_pr.hits.fn -
+            self.mcc.hits.tp - self.mcc.hits.fn
+        )
+    
+    def test_scores_of_all_articles(self):
+        expected = self.expected_scores(self.auc_pr, self.mcc)
+        self.assert_scores(self.bootstrap.scores([1] * 200), expected)
+    
+    def test_scores_of_a_sample(self):
+        # the population: the articles in the order of the results, then
+        # the ones without results that are True in the GS
+        result_dois = self.results.keys()
+        missed_dois = [
+            doi for doi, item, rank, conf in self.gs_rows
+            if item and doi not in self.results
+        ]
+        excluded = set(result_dois[5:20] + missed_dois[:2])
+        evaluated = len(result_dois)
+        weights = [1] * 200
+        
+        for i in range(5, 20) + range(evaluated, evaluated + 2):
+            weights[i] = 0
+        
+        self.assert_scores(
+            self.bootstrap.scores(weights),
+            self.expected_scores(*self.evaluate(excluded))
+        )
+    
+    def test_no_classification_vectors(self):
+        self.assertRaises(
+            AssertionError, ArticleBootstrap, self.auc_pr,
+            ArticleMccEvaluation()
+        )
+    
+
+if __name__ == '__main__':
+    unittest.main()
@@ -26,6 +26,21 @@ class ProteinEvaluationTest(CalculationAssertions):
         self.evaluator.evaluate_item(3, [0,1,2])
         self.assert_hits(self.evaluator.hits, tp=2, fp=3, fn=2)
     
+    def test_evaluate_item_in_frozen_set(self):
+        rc = Mock()
+        rc.item = 1
+        self.evaluator.evaluate_item(rc, frozenset([0,1,2]))
+        self.assert_hits(self.evaluator.hits, tp=3, fp=2, fn=1)
+        rc.item = 3
+        self.evaluator.evaluate_item(rc, frozenset([0,1,2]))
+        self.assert_hits(self.evaluator.hits, tp=3, fp=3, fn=1)
+    
+    def test_count_hit(self):
+        self.evaluator.count_hit(True)
+        self.assert_hits(self.evaluator.hits, tp=3, fp=2, fn=1)
+        self.evaluator.count_hit(False)
+        self.assert_hits(self.evaluator.hits, tp=3, fp=3, fn=1)
+    
     def test_evaluate_item_with_illegal_std_items(self):
         self.assertRaises(
             AssertionError, self.evaluator.evaluate_item, 1, (0,1,2)
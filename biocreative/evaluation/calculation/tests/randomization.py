@@ -0,0 +1,185 @@
+import random
+import unittest
+
+from mock import Mock
+
+from biocreative.evaluation.calculation.randomization import ABSENT, \
+    AbstractRandomization, ArticleRandomization, ProteinRandomization
+from biocreative.evaluation.container.article_dict import ArticleDataDict
+from biocreative.evaluation.container.protein_dict import ProteinDataDict
+from biocreative.evaluation.controller.article import ArticleEvaluator
+from biocreative.evaluation.controller.protein import ProteinEvaluator
+
+class AbstractRandomizationTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.test = AbstractRandomization(10)
+        self.test.SCORES = ('different', 'equal')
+        self.logger_mock = self.test.logger = Mock()
+    
+    def test_init_state(self):
+        self.assertEqual(self.test.documents, 10)
+        self.assertEqual(self.test.observed_differences, None)
+    
+    def test_abstract_methods(self):
+        self.assertRaises(NotImplementedError, self.test.observed)
+        self.assertRaises(
+            NotImplementedError, self.test.shuffle, random.Random(1)
+        )
+    
+    def test_p_values(self):
+        self.test.observed = lambda: ((1.0, 0.5), (0.0, 0.5))
+        self.test.shuffle = lambda rand: (
+            (rand.random(), 0.5), (rand.random(), 0.5)
+        )
+        p_values = self.test.p_values(2500)
+        self.assertEqual(p_values[0][:3], ('different', 1.0, 0.0))
+        self.assertTrue(p_values[0][3] < 0.01)
+        self.assertEqual(p_values[1], ('equal', 0.5, 0.5, 1.0))
+        self.assertEqual(p_values, self.test.p_values(2500))
+    
+    def test_shuffles(self):
+        self.test.observed_differences = [0.5, 0.0]
+        self.test.shuffle = lambda rand: ((1.0, 0.0), (0.0, 0.0))
+        self.assertEqual(self.test.shuffles(1, 20), [20, 20])
+        self.test.shuffle = lambda rand: ((0.25, 0.0), (0.0, 0.0))
+        self.assertEqual(self.test.shuffles(1, 20), [0, 20])
+    
+
+class ProteinRandomizationTest(unittest.TestCase):
+    
+    def setUp(self):
+        rand = random.Random(1)
+        self.gs_rows = [
+            ("d%i" % d, "p%i" % p, None, None)
+            for d in range(30) for p in range(rand.randint(1, 4))
+        ]
+        self.first = self.evaluate(self.gs_rows)
+        self.second = self.evaluate([
+            ("d%i" % d, "p%i" % p, None, None)
+            for d in range(30) for p in range(2, rand.randint(2, 8))
+        ])
+        self.test = ProteinRandomization(self.first, self.second)
+    
+    def evaluate(self, rows):
+        gold_standard = ProteinDataDict()
+        gold_standard.load_from(self.gs_rows)
+        results = ProteinDataDict()
+        results.load_from(rows)
+        results.add_entries_only_in(gold_standard)
+        return ProteinEvaluator(0).process(results, gold_standard)
+    
+    def test_init_state(self):
+        self.assertEqual(self.test.documents, 30)
+        self.assertEqual(
+            sorted(self.test.first + self.test.second), range(60)
+        )
+    
+    def test_observed(self):
+        for scores, (micro, macro) in zip(
+            self.test.observed(), (self.first, self.second)
+        ):
+            for value, expected in zip(scores, (
+                macro.f_score, macro.avrg_p, micro.f_score, micro.avrg_p
+            )):
+                self.assertAlmostEqual(value, expected, 10)
+    
+    def test_shuffle(self):
+        first, second = self.test.shuffle(random.Random(1))
+        observed = self.test.observed()
+        self.assertNotEqual(first, observed[0])
+        self.assertAlmostEqual(
+            first[0] + second[0], observed[0][0] + observed[1][0], 10
+        )
+    
+    def test_p_values(self):
+        p_values = self.test.p_values(200)
+        self.assertEqual(
+            [name for name, a, b, p in p_values],
+            list(ProteinRandomization.SCORES)
+        )
+        
+        for name, a, b, p in p_values:
+            self.assertTrue(a > b)
+            self.assertTrue(p < 0.05)
+    
+    def test_same_runs(self):
+        test = ProteinRandomization(self.first, self.first)
+        
+        for name, a, b, p in test.p_values(50):
+            self.assertAlmostEqual(a, b, 10)
+            self.assertEqual(p, 1.0)
+    
+    def test_different_documents(self):
+        del self.second[1]["d1"]
+        self.assertRaises(
+            AssertionError, ProteinRandomization, self.first, self.second
+        )
+    
+
+class ArticleRandomizationTest(unittest.TestCase):
+    
+    def setUp(self):
+        rand = random.Random(1)
+        self.gs_rows = [
+            (doi, rand.random() < 0.3, None, None) for doi in range(100)
+        ]
+        self.first = self.evaluate([
+            (doi, item, None, 0.5) for doi, item, rank, conf in self.gs_rows
+            if doi % 10
+        ])
+        self.second = self.evaluate([
+            (doi, rand.random() < 0.3, None, 0.5) for doi in range(100)
+        ])
+        self.test = ArticleRandomization(self.first, self.second)
+    
+    def evaluate(self, rows):
+        gold_standard = ArticleDataDict()
+        gold_standard.load_from(self.gs_rows)
+        results = ArticleDataDict()
+        results.load_from(rows)
+        return ArticleEvaluator(0).process(results, gold_standard)
+    
+    def test_init_state(self):
+        self.assertEqual(self.test.documents, 100)
+        self.assertEqual(self.test.alike[ABSENT], 0)
+        self.assertEqual(
+            sum(self.test.alike) +
+            sum(articles for classes, articles in self.test.groups), 100
+        )
+        self.assertEqual(
+            sum(articles for (a, b), articles in self.test.groups
+                if a == ABSENT), 10
+        )
+    
+    def test_observed(self):
+        for scores, (auc_pr, mcc) in zip(
+            self.test.observed(), (self.first, self.second)
+        ):
+            self.assertEqual(scores, [mcc.accuracy, mcc.mcc_score])
+    
+    def test_shuffle(self):
+        first, second = self.test.shuffle(random.Random(1))
+        self.assertNotEqual(first, self.test.observed()[0])
+        self.assertTrue(first[0] < 1.0)
+    
+    def test_p_values(self):
+        p_values = self.test.p_values(500)
+        self.assertEqual(
+            [name for name, a, b, p in p_values],
+            list(ArticleRandomization.SCORES)
+        )
+        
+        for name, a, b, p in p_values:
+            self.assertEqual(a, 1.0)
+            self.assertTrue(p < 0.01)
+    
+    def test_no_classification_vectors(self):
+        self.first[1].dois = None
+        self.assertRaises(
+            AssertionError, ArticleRandomization, self.first, self.second
+        )
+    
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+import unittest
+
+from biocreative.evaluation.calculation.hits import Hits
+from biocreative.evaluation.calculation.sweep import SweepPoint
+
+class SweepPointTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.hits = Hits(1, 2, 3)
+        self.point = SweepPoint(
+            5, self.hits, (0.1, 0.2, 0.3, 0.4), (0.5, 0.6, 0.7, 0.8)
+        )
+    
+    def test_init_state(self):
+        self.assertEqual(self.point.limit, 5)
+        self.assertEqual(self.point.hits, self.hits)
+        self.assertEqual(self.point.micro_precision, 0.1)
+        self.assertEqual(self.point.micro_avrg_p, 0.4)
+        self.assertEqual(self.point.macro_recall, 0.6)
+        self.assertEqual(self.point.macro_f_score, 0.7)
+    
+    def test_scores(self):
+        self.assertEqual(
+            self.point.scores(), (0.5, 0.6, 0.7, 0.8, 0.1, 0.2, 0.3, 0.4)
+        )
+    
+    def test_best(self):
+        scores = (0.0, 0.0, 0.0, None)
+        points = [
+            SweepPoint(limit, self.hits, scores, (0.0, 0.0, f, None))
+            for limit, f in ((0.1, 0.2), (0.3, 0.5), (0.5, 0.5), (0.7, 0.4))
+        ]
+        self.assertEqual(SweepPoint.best(points), points[2])
+        self.assertEqual(
+            SweepPoint.best(points, 'micro_f_score'), points[3]
+        )
+        self.assertEqual(SweepPoint.best([]), None)
+    
+
+if __name__ == '__main__':
+    unittest.main()
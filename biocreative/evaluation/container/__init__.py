@@ -11,8 +11,13 @@ License: GNU Public License, latest version.
 from biocreative.evaluation import class_loader
 from biocreative.evaluation.settings import Evaluate
 
-def container_factory(evaluation_type):
+def container_factory(evaluation_type, arrays=False):
+    """Return the data container class for the evaluation type; if arrays
+    is True, the class storing INT and IPT results as ResultArrays.
+    """
     if evaluation_type == Evaluate.ACT:
         return class_loader("ArticleDataDict")
+    elif arrays:
+        return class_loader("ProteinArrayDict")
     else:
         return class_loader("ProteinDataDict")
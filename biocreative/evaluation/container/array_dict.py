@@ -0,0 +1,214 @@
+import logging
+
+from array import array
+from itertools import islice
+
+from biocreative.evaluation.container.protein_dict import ProteinDataDict
+from biocreative.evaluation.container.results import ResultContainer
+from biocreative.evaluation.file_io.batch import ResultBatch
+
+RANK = 'l'
+CONFIDENCE = 'd'
+
+class ResultArrays(object):
+    """Stores the results of one DOI as parallel columns: a list of the
+    (interned) items and arrays of the ranks and confidences (if given).
+    
+    Ordering is the same as for lists of ResultContainers (see their
+    sort_key), but done as a sort of the row indices (an "argsort") that
+    is applied to all columns at once; no container objects are created.
+    """
+    
+    __slots__ = ('items', 'ranks', 'confidences')
+    
+    def __init__(self):
+        self.items = []
+        self.ranks = None # array of ranks if the results have them
+        self.confidences = None # array of confidences if given
+    
+    def __len__(self):
+        return len(self.items)
+    
+    def __getitem__(self, index):
+        "Return the result at index as a ResultContainer (a copy)."
+        return ResultContainer(
+            self.items[index],
+            rank=None if self.ranks is None else self.ranks[index],
+            confidence=None if self.confidences is None
+            else self.confidences[index]
+        )
+    
+    def append(self, item, rank, confidence):
+        "Append a result row to the columns."
+        if not self.items:
+            self.ranks = None if rank is None else array(RANK)
+            self.confidences = None if confidence is None \
+                else array(CONFIDENCE)
+        elif (rank is None) != (self.ranks is None) or \
+             (confidence is None) != (self.confidences is None):
+            raise ValueError("results with and without rank or confidence")
+        
+        self.items.append(item)
+        
+        if rank is not None:
+            self.ranks.append(rank)
+        
+        if confidence is not None:
+            self.confidences.append(confidence)
+    
+    def argsort(self):
+        """Return the row indices in result order: by rank, by (descending)
+        confidence and item, or by item.
+        """
+        items, ranks, confidences = self.items, self.ranks, self.confidences
+        
+        if ranks is not None:
+            key = ranks.__getitem__
+        elif confidences is not None:
+            key = lambda i: (-confidences[i], items[i])
+        else:
+            key = items.__getitem__
+        
+        return sorted(xrange(len(items)), key=key)
+    
+    def sort(self):
+        "Sort the columns in place, ensuring no two results have one rank."
+        order = self.argsort()
+        self.items = [self.items[i] for i in order]
+        
+        if self.ranks is not None:
+            self.ranks = array(RANK, (self.ranks[i] for i in order))
+            self.assert_unique_ranks()
+        
+        if self.confidences is not None:
+            self.confidences = array(
+                CONFIDENCE, (self.confidences[i] for i in order)
+            )
+    
+    def assert_unique_ranks(self):
+        "Raise a RuntimeError if adjacent (sorted) rows share a rank."
+        ranks = self.ranks
+        
+        for i in xrange(1, len(ranks)):
+            if ranks[i] == ranks[i - 1]:
+                raise RuntimeError("duplicate ranks: '%s' vs. '%s'" % (
+                    str(self[i - 1]), str(self[i])
+                ))
+    
+    def cut(self, cutoff=0, min_conf=0.0):
+        """Return the number of (sorted) results to evaluate: at most cutoff
+        results (if > 0), stopping before the first one with a confidence
+        below min_conf.
+        """
+        end = len(self.items)
+        
+        if cutoff and cutoff < end:
+            end = cutoff
+        
+        if self.confidences is not None:
+            confidences = self.confidences
+            
+            for i in xrange(end):
+                if confidences[i] < min_conf:
+                    return i
+        
+        return end
+    
+    def relevance(self, std_items, cutoff=0, min_conf=0.0):
+        """Return the list of booleans telling if the results (as cut()) are
+        in the collection of GS items.
+        """
+        return [
+            item in std_items
+            for item in islice(self.items, self.cut(cutoff, min_conf))
+        ]
+    
+
+class ProteinArrayDict(ProteinDataDict):
+    """Result container for INT and IPT data storing ResultArrays instead of
+    lists of ResultContainers per DOI.
+    
+    Meant for evaluating the results as they were read, i.e., it does not
+    support the homonym ortholog mapping and organism filtering, and its
+    values can not be used where lists of ResultContainers are expected
+    (e.g., for the debug output).
+    """
+    
+    def __init__(self, *args, **kwds):
+        super(ProteinArrayDict, self).__init__(*args, **kwds)
+        self.logger = logging.getLogger('ProteinArrayDict')
+    
+    def load_from(self, data_iterator, gold_standard=None):
+        """Load the data dictionary from a given iterator as described for
+        AbstractDataDict, appending the rows to the DOIs' arrays.
+        """
+        self.ignored = (
+            set() if gold_standard and len(gold_standard) else None
+        )
+        doi_items = {}
+        
+        for data in data_iterator:
+            rows = data if isinstance(data, ResultBatch) else (data,)
+            
+            for doi, result, rank, confidence in rows:
+                if self.ignored is not None and \
+                   self._ignore(doi, gold_standard):
+                    continue
+                
+                if doi in doi_items:
+                    items = doi_items[doi]
+                    assert result not in items, \
+                        "duplicate result '%s' for DOI %s" % (
+                            str(result), doi
+                        )
+                else:
+                    items = doi_items[doi] = set()
+                    self[doi] = ResultArrays()
+                
+                items.add(result)
+                self[doi].append(result, rank, confidence)
+        
+        self.sort_results()
+        
+        if self.ignored is not None and len(self.ignored):
+            self.logger.info("ignored %i documents not in GS" % len(
+                self.ignored
+            ))
+        
+        logging.info("loaded %i annotations" %
+            sum(len(i) for i in self.values())
+        )
+    
+    def add_entries_only_in(self, other, Value_Type=ResultArrays):
+        "Add empty ResultArrays to this dictionary if the other has it."
+        return super(ProteinArrayDict, self).add_entries_only_in(
+            other, Value_Type
+        )
+    
+    def sort_results(self):
+        "Sort the results using rank or confidence."
+        for result_arrays in self.values():
+            result_arrays.sort()
+    
+    def snapshot(self):
+        "Return the ordered results of all DOIs as plain tuples."
+        return [
+            (doi, rc.item, rc.rank, rc.confidence)
+            for doi in self.keys() for rc in self[doi]
+        ]
+    
+    def restore(self, rows):
+        "Append the result rows to the DOIs' arrays in the given order."
+        for doi, result, rank, confidence in rows:
+            if doi not in self:
+                self[doi] = ResultArrays()
+            
+            self[doi].append(result, rank, confidence)
+    
+    def item_sets(self):
+        "Return a dictionary of the frozen sets of result items per DOI."
+        return dict(
+            (doi, frozenset(result_arrays.items))
+            for doi, result_arrays in self.iteritems()
+        )
+    
@@ -1,6 +1,7 @@
 import logging
 
 from biocreative.evaluation.container.data_dict import AbstractDataDict
+from biocreative.evaluation.container.results import ResultContainer
 
 class ArticleDataDict(AbstractDataDict):
     """Data container for ACT data.
@@ -44,12 +45,35 @@ class ArticleDataDict(AbstractDataDict):
         self.order.append(doi)
         self[doi] = result_container
     
+    def add_entries_only_in(self, other, Value_Type=None):
+        """Never add entries for DOIs only the other dictionary has: there
+        are no empty ACT results (the FN counts are taken from the GS).
+        
+        Returns 0.
+        """
+        return 0
+    
     def sort_results(self):
         "Sort the ACT results using the sorting logic of ResultContainers."
-        result_doi = [(r, d) for d, r in self.items()]
+        result_doi = [(r.sort_key, d, r) for d, r in self.items()]
         result_doi.sort()
+        ResultContainer.assert_unique_ranks([r for k, d, r in result_doi])
         # store the final order in the order attr:
-        self.order = [d for r, d in result_doi]
+        self.order = [d for k, d, r in result_doi]
+    
+    def snapshot(self):
+        "Return the results in their sorted order as plain tuples."
+        return [
+            (doi, self[doi].item, self[doi].rank, self[doi].confidence)
+            for doi in self.order
+        ]
+    
+    def restore(self, rows):
+        "Add the result rows, keeping their order."
+        for doi, result, rank, confidence in rows:
+            self.add_result(
+                doi, ResultContainer(result, rank=rank, confidence=confidence)
+            )
     
     def true_items(self):
         "Return the number of items in the collection annotated with True."
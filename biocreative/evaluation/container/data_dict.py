@@ -2,6 +2,8 @@ import logging
 
 import biocreative.evaluation.container.results as results
 
+from biocreative.evaluation.file_io.batch import ResultBatch
+
 class AbstractDataDict(dict):
     """Base data container.
     
@@ -46,6 +48,22 @@ class AbstractDataDict(dict):
         """
         raise NotImplementedError('abstract')
     
+    def snapshot(self):
+        """Return the sorted content of the dictionary as a list of plain
+        (doi, result, rank, confidence) tuples for restore().
+        
+        Abstract method.
+        """
+        raise NotImplementedError('abstract')
+    
+    def restore(self, rows):
+        """Load the dictionary from the rows of a snapshot(), which already
+        are checked for duplicates and sorted.
+        
+        Abstract method.
+        """
+        raise NotImplementedError('abstract')
+    
     def keys(self):
         "Return the sorted keys of the dictionary."
         dois = super(AbstractDataDict, self).keys()
@@ -55,20 +73,27 @@ class AbstractDataDict(dict):
     def load_from(self, data_iterator, gold_standard=None):
         """Load the data dictionary from a given iterator, skipping any DOIs
         in the GS if it is given and those DOIs are not found.
+        
+        The iterator may yield (doi, result, rank, confidence) tuples or
+        whole ResultBatch columns (see file_io.batch).
         """
         self.ignored = (
             set() if gold_standard and len(gold_standard) else None
         )
         
-        for doi, result, rank, confidence in data_iterator:
-            if self.ignored is not None and self._ignore(doi, gold_standard):
-                continue
+        for data in data_iterator:
+            rows = data if isinstance(data, ResultBatch) else (data,)
             
-            self.assert_duplicates(doi, result)
-            result_container = results.ResultContainer(
-                result, rank=rank, confidence=confidence
-            )
-            self.add_result(doi, result_container)
+            for doi, result, rank, confidence in rows:
+                if self.ignored is not None and \
+                   self._ignore(doi, gold_standard):
+                    continue
+                
+                self.assert_duplicates(doi, result)
+                result_container = results.ResultContainer(
+                    result, rank=rank, confidence=confidence
+                )
+                self.add_result(doi, result_container)
         
         self.sort_results()
         
@@ -1,6 +1,9 @@
 import logging
 
+from operator import attrgetter
+
 from biocreative.evaluation.container.data_dict import AbstractDataDict
+from biocreative.evaluation.container.results import ResultContainer
 
 class ProteinDataDict(AbstractDataDict):
     """Data container for INT and IPT data; Common homonym ortholog mapping
@@ -10,29 +13,75 @@ class ProteinDataDict(AbstractDataDict):
     def __init__(self, *args, **kwds):
         super(ProteinDataDict, self).__init__(*args, **kwds)
         self.logger = logging.getLogger('ProteinDataDict')
+        # the sets of items per DOI used to detect duplicates while loading
+        self._doi_items = {}
+    
+    def load_from(self, data_iterator, gold_standard=None):
+        """Load the data dictionary (see AbstractDataDict), dropping the
+        item sets used to detect duplicates afterwards.
+        """
+        try:
+            super(ProteinDataDict, self).load_from(
+                data_iterator, gold_standard
+            )
+        finally:
+            self._doi_items = {}
     
     def assert_duplicates(self, doi, result):
         """Assert no duplicate result is read and create the key with an
         empty list value if the DOI hasn't been added so far.
         """
         if doi in self:
-            others = tuple(rc.item for rc in self[doi])
-            assert result not in others, \
+            if doi not in self._doi_items:
+                self._doi_items[doi] = set(rc.item for rc in self[doi])
+            
+            assert result not in self._doi_items[doi], \
                 "duplicate result '%s' for DOI %s" % (
                     str(result), doi
                 )
         else:
             self[doi] = list()
+            self._doi_items[doi] = set()
     
     def add_result(self, doi, result_container):
         "Add a given ResultContainer for a doi to the dictionary's list."
         self[doi].append(result_container)
+        
+        if doi in self._doi_items:
+            self._doi_items[doi].add(result_container.item)
     
     def sort_results(self):
         "Sort the results using rank or confidence."
+        sort_key = attrgetter('sort_key')
+        
         for doi in self:
             r_list = self[doi]
-            r_list.sort() # sort in place
+            r_list.sort(key=sort_key) # sort in place
+            ResultContainer.assert_unique_ranks(r_list)
+    
+    def snapshot(self):
+        "Return the ordered results of all DOIs as plain tuples."
+        return [
+            (doi, rc.item, rc.rank, rc.confidence)
+            for doi in self.keys() for rc in self[doi]
+        ]
+    
+    def restore(self, rows):
+        "Append the result rows to the DOIs' lists in the given order."
+        for doi, result, rank, confidence in rows:
+            if doi not in self:
+                self[doi] = list()
+            
+            self[doi].append(
+                ResultContainer(result, rank=rank, confidence=confidence)
+            )
+    
+    def item_sets(self):
+        "Return a dictionary of the frozen sets of result items per DOI."
+        return dict(
+            (doi, frozenset(rc.item for rc in result_list))
+            for doi, result_list in self.iteritems()
+        )
     
     def true_items(self):
         "Return the number of items in the collection annotated."
@@ -60,6 +60,16 @@ class ContainerTests(unittest.TestCase):
             RuntimeError, add.load_from, self.article_data_iterator()
         )
     
+    def test_article_snapshot_restore(self):
+        add = ArticleDataDict()
+        add.load_from(self.article_data_iterator())
+        restored = ArticleDataDict()
+        restored.restore(add.snapshot())
+        self.compare_keys(add.keys(), restored)
+        
+        for doi in add:
+            self.compare_result_container_content(add[doi], restored[doi])
+    
     # ===================
     # = ProteinDataDict =
     # ===================
@@ -73,9 +83,11 @@ class ContainerTests(unittest.TestCase):
         pdd.load_from(self.protein_data_iterator())
         test_iter = iter(pdd)
         expected_pdd = ContainerTests.protein_data_dict()
-        self.compare_keys([s.DOI1, s.DOI2], pdd)
+        # the keys are sorted, and sentinels are ordered by their address
+        dois = sorted([s.DOI1, s.DOI2])
+        self.compare_keys(dois, pdd)
         
-        for doi in [s.DOI1, s.DOI2]:
+        for doi in dois:
             next_doi = test_iter.next()
             self.assertEqual(doi, next_doi)
             self.assertEqual(len(pdd[doi]), len(expected_pdd[doi]))
@@ -102,6 +114,21 @@ class ContainerTests(unittest.TestCase):
             RuntimeError, pdd.load_from, self.protein_data_iterator()
         )
     
+    def test_protein_snapshot_restore(self):
+        pdd = ProteinDataDict()
+        pdd.load_from(self.protein_data_iterator())
+        restored = ProteinDataDict()
+        restored.restore(pdd.snapshot())
+        self.compare_keys(pdd.keys(), restored)
+        
+        for doi in pdd:
+            self.assertEqual(len(pdd[doi]), len(restored[doi]))
+            
+            for expected_rc, received_rc in zip(pdd[doi], restored[doi]):
+                self.compare_result_container_content(
+                    expected_rc, received_rc
+                )
+    
     # ===========
     # = Helpers =
     # ===========
@@ -0,0 +1,135 @@
+import unittest
+
+from biocreative.evaluation.container.array_dict import \
+    ProteinArrayDict, ResultArrays
+from biocreative.evaluation.container.protein_dict import ProteinDataDict
+
+class ResultArraysTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.arrays = ResultArrays()
+    
+    def test_init_state(self):
+        self.assertEqual(len(self.arrays), 0)
+        self.assertEqual(self.arrays.ranks, None)
+        self.assertEqual(self.arrays.confidences, None)
+    
+    def test_append(self):
+        self.arrays.append("A", 2, 0.5)
+        self.arrays.append("B", 1, 0.7)
+        self.assertEqual(len(self.arrays), 2)
+        self.assertEqual(self.arrays.items, ["A", "B"])
+        self.assertEqual(self.arrays.ranks.tolist(), [2, 1])
+        self.assertEqual(self.arrays.confidences.tolist(), [0.5, 0.7])
+        self.assertEqual(str(self.arrays[1]), "B\t1\t0.700000")
+    
+    def test_append_raises_error_on_missing_columns(self):
+        self.arrays.append("A", 1, None)
+        self.assertRaises(ValueError, self.arrays.append, "B", None, None)
+        self.assertRaises(ValueError, self.arrays.append, "B", 2, 0.5)
+    
+    def test_sort_by_rank(self):
+        for item, rank in (("A", 3), ("B", 1), ("C", 2)):
+            self.arrays.append(item, rank, 1.0 / rank)
+        
+        self.assertEqual(self.arrays.argsort(), [1, 2, 0])
+        self.arrays.sort()
+        self.assertEqual(self.arrays.items, ["B", "C", "A"])
+        self.assertEqual(self.arrays.ranks.tolist(), [1, 2, 3])
+        self.assertEqual(
+            self.arrays.confidences.tolist(), [1.0, 0.5, 1.0 / 3]
+        )
+    
+    def test_sort_by_confidence_and_item(self):
+        for item, conf in (("C", 0.5), ("A", 0.5), ("B", 0.9)):
+            self.arrays.append(item, None, conf)
+        
+        self.arrays.sort()
+        self.assertEqual(self.arrays.items, ["B", "A", "C"])
+    
+    def test_sort_by_item(self):
+        for item in ("C", "A", "B"):
+            self.arrays.append(item, None, None)
+        
+        self.arrays.sort()
+        self.assertEqual(self.arrays.items, ["A", "B", "C"])
+    
+    def test_sort_raises_error_on_duplicate_ranks(self):
+        self.arrays.append("A", 1, None)
+        self.arrays.append("B", 1, None)
+        self.assertRaises(RuntimeError, self.arrays.sort)
+    
+    def test_cut(self):
+        for item, conf in (("A", 0.9), ("B", 0.7), ("C", 0.4), ("D", 0.8)):
+            self.arrays.append(item, None, conf)
+        
+        self.assertEqual(self.arrays.cut(), 4)
+        self.assertEqual(self.arrays.cut(2), 2)
+        self.assertEqual(self.arrays.cut(0, 0.5), 2)
+        self.assertEqual(self.arrays.cut(1, 0.5), 1)
+    
+    def test_relevance(self):
+        for item, rank in (("A", 1), ("B", 2), ("C", 3)):
+            self.arrays.append(item, rank, None)
+        
+        std_items = frozenset(["A", "C"])
+        self.assertEqual(
+            self.arrays.relevance(std_items), [True, False, True]
+        )
+        self.assertEqual(self.arrays.relevance(std_items, 2), [True, False])
+    
+
+class ProteinArrayDictTest(unittest.TestCase):
+    
+    ROWS = [
+        ("a", "X", 2, None), ("b", "Y", 1, None), ("a", "Z", 1, None),
+        ("c", "W", 1, None),
+    ]
+    
+    def setUp(self):
+        self.pad = ProteinArrayDict()
+    
+    def test_load_from(self):
+        self.pad.load_from(self.ROWS, gold_standard={"a": [], "b": []})
+        self.assertEqual(self.pad.keys(), ["a", "b"])
+        self.assertEqual(self.pad["a"].items, ["Z", "X"])
+        self.assertEqual(self.pad["a"].ranks.tolist(), [1, 2])
+        self.assertEqual(self.pad.ignored, set(["c"]))
+        self.assertEqual(self.pad.true_items(), 3)
+    
+    def test_load_from_raises_error_on_duplicates(self):
+        self.assertRaises(
+            AssertionError, self.pad.load_from,
+            [("a", "X", 1, None), ("a", "X", 2, None)]
+        )
+    
+    def test_load_from_is_ordered_as_protein_data_dict(self):
+        rows = [
+            ("a", "X", None, 0.5), ("a", "Y", None, 0.9),
+            ("a", "A", None, 0.5), ("b", "B", None, 0.1),
+        ]
+        pdd = ProteinDataDict()
+        pdd.load_from(rows)
+        self.pad.load_from(rows)
+        self.assertEqual(self.pad.snapshot(), pdd.snapshot())
+    
+    def test_snapshot_and_restore(self):
+        self.pad.load_from(self.ROWS)
+        other = ProteinArrayDict()
+        other.restore(self.pad.snapshot())
+        self.assertEqual(other.snapshot(), self.pad.snapshot())
+    
+    def test_add_entries_only_in(self):
+        self.assertEqual(self.pad.add_entries_only_in({"a": None}), 1)
+        self.assertTrue(isinstance(self.pad["a"], ResultArrays))
+        self.assertEqual(self.pad.prune_empty_sets(), 1)
+    
+    def test_item_sets(self):
+        self.pad.load_from(self.ROWS)
+        self.assertEqual(
+            self.pad.item_sets()["a"], frozenset(["X", "Z"])
+        )
+    
+
+if __name__ == '__main__':
+    unittest.main()
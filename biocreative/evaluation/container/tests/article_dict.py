@@ -3,6 +3,7 @@ import unittest
 from mock import Mock, sentinel
 
 from biocreative.evaluation.container.article_dict import ArticleDataDict
+from biocreative.evaluation.container.results import ResultContainer
 
 class ArticleDataDictTest(unittest.TestCase):
     
@@ -49,11 +50,18 @@ class ArticleDataDictTest(unittest.TestCase):
         )
     
     def test_sort_result(self):
-        self.add[1] = "b"
-        self.add[2] = "c"
-        self.add[3] = "a"
+        self.add[1] = ResultContainer(True, rank=2)
+        self.add[2] = ResultContainer(False, rank=1)
+        self.add[3] = ResultContainer(True, rank=1)
+        self.add[4] = ResultContainer(False, rank=3)
         self.add.sort_results()
-        self.assertEqual(self.add.order, [3,1,2])
+        self.assertEqual(self.add.order, [3,1,4,2])
+    
+    def test_sort_result_raises_error_on_duplicate_ranks(self):
+        self.add[1] = ResultContainer(True, rank=1)
+        self.add[2] = ResultContainer(False, rank=1)
+        self.add[3] = ResultContainer(False, rank=1)
+        self.assertRaises(RuntimeError, self.add.sort_results)
     
     def test_true_items(self):
         true_result_container = Mock()
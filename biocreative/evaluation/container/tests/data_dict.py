@@ -4,6 +4,7 @@ from mock import Mock, patch, sentinel
 from random import random, randint
 
 from biocreative.evaluation.container.data_dict import AbstractDataDict
+from biocreative.evaluation.file_io.batch import ResultBatch
 
 class AbstractDataDictTest(unittest.TestCase):
     
@@ -198,6 +199,23 @@ class AbstractDataDictTest(unittest.TestCase):
         self.assertTrue(dd.add_result.call_count, raw_data_processed)
         
     
+    @patch('biocreative.evaluation.container.results.ResultContainer')
+    def test_load_from_batches(self, rc_mock):
+        dd = self.get_mocked_data_dict()
+        raw_data = [i for i in self.get_data_iterator()]
+        batches = [
+            ResultBatch(*[list(column) for column in zip(*raw_data[:60])]),
+            ResultBatch(*[list(column) for column in zip(*raw_data[60:])]),
+        ]
+        dd.load_from(batches)
+        self.assertEqual(dd.assert_duplicates.call_count, 100)
+        self.assertEqual(dd.add_result.call_count, 100)
+        self.assertEqual(dd.sort_results.call_count, 1)
+        self.assertEqual(
+            dd.assert_duplicates.call_args_list,
+            [((doi, result), {}) for doi, result, r, c in raw_data]
+        )
+    
     @staticmethod
     def get_mocked_data_dict():
         dd = AbstractDataDict()
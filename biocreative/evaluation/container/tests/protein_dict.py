@@ -3,6 +3,7 @@ import unittest
 from mock import Mock, sentinel
 
 from biocreative.evaluation.container.protein_dict import ProteinDataDict
+from biocreative.evaluation.container.results import ResultContainer
 
 class ProteinDataDictTest(unittest.TestCase):
     def setUp(self):
@@ -41,11 +42,36 @@ class ProteinDataDictTest(unittest.TestCase):
         self.assert_sentinel_DOI_value_is([sentinel.ResultContainer])
     
     def test_sort_results(self):
-        self.pdd[sentinel.DOI] = [3,2,1,4]
+        rcs = [ResultContainer("A", rank=r) for r in (3,2,1,4)]
+        self.pdd[sentinel.DOI] = list(rcs)
         self.pdd.sort_results()
         
         self.assert_sentinel_DOI_is_the_only_key()
-        self.assert_sentinel_DOI_value_is([1,2,3,4])
+        self.assert_sentinel_DOI_value_is([rcs[2], rcs[1], rcs[0], rcs[3]])
+    
+    def test_sort_results_raises_error_on_duplicate_ranks(self):
+        self.pdd[sentinel.DOI] = [
+            ResultContainer("A", rank=1), ResultContainer("B", rank=1)
+        ]
+        self.assertRaises(RuntimeError, self.pdd.sort_results)
+    
+    def test_load_from_drops_item_sets(self):
+        self.pdd.load_from([("doi", "A", 1, None), ("doi", "B", 2, None)])
+        self.assertEqual(["A", "B"], [rc.item for rc in self.pdd["doi"]])
+        self.assertEqual({}, self.pdd._doi_items)
+    
+    def test_load_from_raises_error_on_duplicates(self):
+        self.assertRaises(
+            AssertionError, self.pdd.load_from,
+            [("doi", "A", 1, None), ("doi", "A", 2, None)]
+        )
+        self.assertEqual({}, self.pdd._doi_items)
+    
+    def test_item_sets(self):
+        self.pdd.load_from([("doi", "A", 1, None), ("doi", "B", 2, None)])
+        self.assertEqual(
+            {"doi": frozenset(["A", "B"])}, self.pdd.item_sets()
+        )
     
     def test_true_items(self):
         self.pdd[1] = [None] * 3
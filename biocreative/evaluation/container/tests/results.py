@@ -116,6 +116,21 @@ class ResultContainerTest(unittest.TestCase):
             shuffle(result)
             result.sort()
             self.assertEqual(expected, result)
+            shuffle(result)
+            result.sort(key=lambda rc: rc.sort_key)
+            self.assertEqual(expected, result)
+    
+    def test_assert_unique_ranks(self):
+        ResultContainer.assert_unique_ranks([
+            ResultContainer(True, rank=1), ResultContainer(False, rank=1)
+        ])
+        self.assertRaises(
+            RuntimeError, ResultContainer.assert_unique_ranks,
+            [ResultContainer("A", rank=1), ResultContainer("B", rank=1)]
+        )
+    
+    def test_no_instance_dict(self):
+        self.assertFalse(hasattr(ResultContainer("A", rank=1), '__dict__'))
     
 
 if __name__ == '__main__':
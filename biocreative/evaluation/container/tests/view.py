@@ -0,0 +1,56 @@
+import unittest
+
+from biocreative.evaluation.container.article_dict import ArticleDataDict
+from biocreative.evaluation.container.protein_dict import ProteinDataDict
+from biocreative.evaluation.container.view import DataDictView
+
+class DataDictViewTest(unittest.TestCase):
+
+    def setUp(self):
+        self.pdd = ProteinDataDict({"b": ["B"], "c": ["C1", "C2"], "a": []})
+        self.view = DataDictView(self.pdd)
+
+    def test_init_state(self):
+        self.assertEqual(self.view.data_dict, self.pdd)
+        self.assertEqual(self.view.dois, None)
+
+    def test_dictionary_access(self):
+        self.assertEqual(len(self.view), 3)
+        self.assertEqual(self.view.keys(), ["a", "b", "c"])
+        self.assertEqual(list(self.view), ["a", "b", "c"])
+        self.assertEqual(self.view.values(), [[], ["B"], ["C1", "C2"]])
+        self.assertEqual(self.view["c"], ["C1", "C2"])
+        self.assertTrue("c" in self.view)
+        self.assertFalse("d" in self.view)
+        self.assertEqual(self.view.get("d"), None)
+
+    def test_delete_entries_not_in(self):
+        self.assertEqual(self.view.delete_entries_not_in({"b": None}), 2)
+        self.assertEqual(len(self.view), 1)
+        self.assertEqual(self.view.items(), [("b", ["B"])])
+        self.assertFalse("c" in self.view)
+        self.assertRaises(KeyError, self.view.__getitem__, "c")
+        self.assertEqual(self.view.get("c"), None)
+        self.assertEqual(len(self.pdd), 3)
+        self.assertTrue(self.pdd["c"] is self.view.data_dict["c"])
+
+    def test_dictionary_methods_apply_to_view(self):
+        self.assertEqual(self.view.true_items(), 3)
+        self.view.delete_entries_not_in({"b": None})
+        self.assertEqual(self.view.true_items(), 1)
+
+    def test_article_dictionary_order(self):
+        add = ArticleDataDict()
+        add.load_from([
+            ("a", False, 3, None), ("b", True, 2, None), ("c", True, 1, None)
+        ])
+        view = DataDictView(add)
+        self.assertEqual(view.keys(), ["c", "b", "a"])
+        self.assertEqual(view.true_items(), 2)
+        view.delete_entries_not_in({"a": None, "c": None})
+        self.assertEqual(view.keys(), ["c", "a"])
+        self.assertEqual(view.true_items(), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
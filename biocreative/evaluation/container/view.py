@@ -0,0 +1,79 @@
+import logging
+
+class DataDictView(object):
+    """Read-only view of a data dictionary (the gold standard), optionally
+    restricted to a subset of its DOIs.
+    
+    Stands in for a copy of the dictionary during an evaluation: the
+    dictionary and its result lists are shared, while
+    delete_entries_not_in() only restricts the DOIs of the view. Any other
+    method of the dictionary's class (e.g., true_items) is applied to the
+    view itself.
+    """
+    
+    def __init__(self, data_dict, dois=None):
+        self.data_dict = data_dict
+        self.dois = dois # None: all DOIs in the dictionary
+        self.logger = logging.getLogger("DataDictView")
+    
+    def __contains__(self, doi):
+        return doi in self.data_dict and \
+               (self.dois is None or doi in self.dois)
+    
+    has_key = __contains__
+    
+    def __getitem__(self, doi):
+        if self.dois is not None and doi not in self.dois:
+            raise KeyError(doi)
+        
+        return self.data_dict[doi]
+    
+    def __len__(self):
+        if self.dois is None:
+            return len(self.data_dict)
+        
+        return sum(1 for doi in self.dois if doi in self.data_dict)
+    
+    def __iter__(self):
+        return iter(self.keys())
+    
+    def __getattr__(self, name):
+        # methods of the dictionary's class, bound to this view
+        function = getattr(self.data_dict.__class__, name).im_func
+        return function.__get__(self, self.__class__)
+    
+    def get(self, doi, default=None):
+        try:
+            return self[doi]
+        except KeyError:
+            return default
+    
+    def keys(self):
+        "Return the (ordered) keys of the dictionary in the view."
+        if self.dois is None:
+            return self.data_dict.keys()
+        
+        return [doi for doi in self.data_dict.keys() if doi in self.dois]
+    
+    def values(self):
+        return [self.data_dict[doi] for doi in self.keys()]
+    
+    def items(self):
+        return [(doi, self.data_dict[doi]) for doi in self.keys()]
+    
+    def iteritems(self):
+        return ((doi, self.data_dict[doi]) for doi in self.keys())
+    
+    def delete_entries_not_in(self, other):
+        "Remove DOIs from the view if the other dictionary does not have it."
+        dois = set(doi for doi in self.keys() if doi in other)
+        cases = len(self) - len(dois)
+        self.dois = dois
+        
+        if cases > 0:
+            self.logger.info("removed %i documents from %s view" % (
+                cases, self.data_dict.__class__.__name__
+            ))
+        
+        return cases
+    
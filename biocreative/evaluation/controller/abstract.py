@@ -10,6 +10,7 @@ class AbstractEvaluator(object):
         self.secondary_eval = None # macro for INT/IPT, MCC+Acc for ACT
         self.results = None
         self.gold_standard = None
+        self.gold_standard_index = None
         self.logger = logging.getLogger("AbstractEvaluator")
         self.reset()
     
@@ -23,11 +24,14 @@ class AbstractEvaluator(object):
     # =============================================
     # = Main Entry Method into Evaluation Process =
     # =============================================
-    def process(self, results, gold_standard):
+    def process(self, results, gold_standard, gold_standard_index=None):
         """Run the evaluation process for a result and GS data dictionary.
         
         This is the main entry method into the evaluation process.
         
+        The optional GS index maps DOIs to frozen sets of the GS items
+        (see ProteinDataDict.item_sets) to look up INT/IPT results in.
+        
         Return the primary (main) and secondary evaluation object:
         ACT, primary: AUC iP/R Evaluation
         ACT, secondary: Accuracy/MCC Evaluation
@@ -37,6 +41,7 @@ class AbstractEvaluator(object):
         self.logger.info("processing results with cutoff=%i" % self.cutoff)
         self.results = results
         self.gold_standard = gold_standard
+        self.gold_standard_index = gold_standard_index
         
         self._prepare()
         self._process()
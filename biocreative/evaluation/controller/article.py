@@ -1,5 +1,9 @@
 import logging
 
+from array import array
+from itertools import imap
+from operator import and_
+
 from biocreative.evaluation.calculation import article_auc_pr, article_mcc
 
 from biocreative.evaluation.controller.abstract import AbstractEvaluator
@@ -7,12 +11,17 @@ from biocreative.evaluation.controller.abstract import AbstractEvaluator
 class ArticleEvaluator(AbstractEvaluator):
     """Implementation of the evaluation process for ACT."""
     
+    # evaluate the results article by article (the reference
+    # implementation) instead of from the classification vectors
+    reference_loop = False
+    
     def reset(self):
         """Reset the internal state to reuse the evaluator."""
         self.primary_eval = article_auc_pr.ArticleAucPrEvaluation()
         self.secondary_eval = article_mcc.ArticleMccEvaluation()
         self.results = None
         self.gold_standard = None
+        self.gold_standard_index = None
         self.logger = logging.getLogger("ArticleEvaluator")
     
     def _prepare(self):
@@ -25,6 +34,12 @@ class ArticleEvaluator(AbstractEvaluator):
     
     def _process(self):
         """Process all articles in the queue."""
+        if not self.reference_loop:
+            dois, results, gold_standard = self._classification_vectors()
+            self._process_vectors(results, gold_standard)
+            self.secondary_eval.dois = dois
+            return
+        
         for doi in self.results.keys():
             if doi not in self.gold_standard:
                 self.logger.error("ignoring unknown doi '%s'" % str(doi))
@@ -40,3 +55,68 @@ class ArticleEvaluator(AbstractEvaluator):
         for this in (self.primary_eval, self.secondary_eval):
             this.evaluate(result_item, std_item, self.cutoff)
     
+    
+    def _classification_vectors(self):
+        """Return the DOIs of the known articles in the (sorted) order of
+        the results, together with their result classifications and GS
+        annotations as boolean vectors in that order.
+        """
+        dois = []
+        results = array('B')
+        gold_standard = array('B')
+        
+        for doi in self.results.keys():
+            if doi not in self.gold_standard:
+                self.logger.error("ignoring unknown doi '%s'" % str(doi))
+                continue
+            
+            result_item = self.results[doi].item
+            std_item = self.gold_standard[doi].item
+            
+            if type(std_item) is not bool:
+                raise TypeError("GS item not a bool (is %s: %s)" % (
+                    std_item.__class__.__name__, str(std_item)
+                ))
+            
+            assert type(result_item) is bool, \
+                "Result item not a bool (is %s: %s)" % (
+                    result_item.__class__.__name__, str(result_item)
+                )
+            dois.append(doi)
+            results.append(result_item)
+            gold_standard.append(std_item)
+        
+        return dois, results, gold_standard
+    
+    def _process_vectors(self, results, gold_standard):
+        """Evaluate the classification vectors, producing the same
+        evaluations as the reference loop.
+        
+        The AUC P/R curve is stored from the cumulative TP count along the
+        GS vector, and the MCC hits are counted from both vectors.
+        """
+        auc_pr = self.primary_eval
+        mcc = self.secondary_eval
+        precisions_at_recall = auc_pr.precisions_at_recall
+        divide = auc_pr._divide
+        std_true = auc_pr.hits.fn
+        recall_divisor = float(std_true)
+        tp = 0
+        
+        for evaluated, std_item in enumerate(gold_standard):
+            tp += std_item
+            precisions_at_recall[divide(tp, recall_divisor)].add(
+                tp / float(evaluated + 1)
+            )
+        
+        auc_pr.hits.tp = tp
+        auc_pr.hits.fp = len(gold_standard) - tp
+        auc_pr.hits.fn = std_true - tp
+        true_positives = sum(imap(and_, results, gold_standard))
+        positives = sum(results)
+        mcc.hits.tp = true_positives
+        mcc.hits.fp = positives - true_positives
+        mcc.hits.fn = tp - true_positives
+        mcc.hits.tn = len(results) - positives - mcc.hits.fn
+        mcc.vectors = (results, gold_standard)
+        mcc.articles = len(self.gold_standard)
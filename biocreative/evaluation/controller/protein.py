@@ -1,23 +1,38 @@
 import logging
 
+from itertools import islice, izip
+
+from biocreative.evaluation.calculation.hits import Hits
 from biocreative.evaluation.calculation.macro_evaluation import \
     ProteinMacroEvaluation
 from biocreative.evaluation.calculation.protein_evaluation import \
     ProteinEvaluation
+from biocreative.evaluation.calculation.sweep import SweepPoint
+from biocreative.evaluation.container.array_dict import \
+    ProteinArrayDict, ResultArrays
 from biocreative.evaluation.controller.abstract import AbstractEvaluator
 
 class ProteinEvaluator(AbstractEvaluator):
     """Implementation of the evaluation process for INT and IPT."""
     
+    # evaluate the results rank by rank (the reference implementation)
+    # instead of from the cumulative hit counts
+    reference_loop = False
+    
     def reset(self):
         """Reset the internal state to reuse the evaluator."""
         self.primary_eval = ProteinEvaluation()
         self.secondary_eval = ProteinMacroEvaluation()
         self.results = None
         self.gold_standard = None
+        self.gold_standard_index = None
         self.logger = logging.getLogger("ProteinEvaluator")
+        self.cutoff_sweep = None # ranks to store SweepPoints at
+        self.min_conf_sweep = None # thresholds, [] for all confidences
+        self.sweep = []
         self._dois = None
-
+        self._relevance = None
+    
     def _prepare(self):
         """Prepare the instance for the evaluation run."""
         assert len(self.results) == len(self.gold_standard), \
@@ -48,7 +63,20 @@ class ProteinEvaluator(AbstractEvaluator):
             std_items = self.gold_standard[doi]
             result_doc = ProteinEvaluation(doi=doi, fn=len(std_items))
             self.secondary_eval[doi] = result_doc
-            
+        
+        if self.min_conf_sweep is not None:
+            self._relevance = self._relevance_lists()
+            self._process_thresholds()
+            return
+        elif not self.reference_loop:
+            self._relevance = self._relevance_lists()
+            self._process_curves(max_rank_in_results)
+            return
+        elif isinstance(self.results, ProteinArrayDict):
+            self._relevance = self._relevance_lists()
+        else:
+            self._relevance = None
+        
         for rank in range(max_rank_in_results):
             for doi in list(self._dois):
                 self._process_doi(doi, rank)
@@ -60,10 +88,267 @@ class ProteinEvaluator(AbstractEvaluator):
             # at this rank over all documents (micro-averaging)
             self.primary_eval.store_p_at_current_r()
     
+    def _process_curves(self, max_rank):
+        """Process the result set from the relevance lists, producing the
+        same evaluations as the reference loop.
+        
+        Instead of evaluating every result on its own, the hits are counted
+        per rank and summed up cumulatively; the per-document recall and
+        precision values are kept in lists in the order of the macro
+        evaluation, so the macro averages at each rank are the same sums.
+        
+        If a cutoff_sweep is set, the scores at each of its ranks are stored
+        as SweepPoints in the sweep list.
+        """
+        docs = self.secondary_eval.values()
+        dois = [doc.doi for doc in docs]
+        relevance = [self._relevance[doi] for doi in dois]
+        gs_sizes = [doc.hits.fn for doc in docs]
+        num_docs = len(docs)
+        recalls = [0.0] * num_docs
+        precisions = [0.0] * num_docs
+        tps = [0] * num_docs
+        # the documents with more relevance values than a rank go first
+        active = sorted(
+            xrange(num_docs), key=lambda i: len(relevance[i]), reverse=True
+        )
+        micro = self.primary_eval
+        macro = self.secondary_eval
+        gs_total = micro.hits.fn
+        tp_total = 0
+        evaluated = 0
+        divide = ProteinEvaluation._divide
+        pending = sorted(self.cutoff_sweep or (), reverse=True)
+        self.sweep = []
+        
+        for rank in xrange(max_rank):
+            while active and len(relevance[active[-1]]) <= rank:
+                active.pop() # no more results for this document
+            
+            num_evaluated = float(rank + 1)
+            
+            for i in active:
+                tp = tps[i] = tps[i] + relevance[i][rank]
+                recalls[i] = divide(tp, float(gs_sizes[i]))
+                precisions[i] = tp / num_evaluated
+                docs[i].precisions_at_recall[recalls[i]].add(precisions[i])
+                tp_total += relevance[i][rank]
+            
+            evaluated += len(active)
+            macro.precisions_at_recall[
+                sum(recalls) / num_docs
+            ].add(sum(precisions) / num_docs)
+            micro.precisions_at_recall[
+                divide(tp_total, float(gs_total))
+            ].add(divide(tp_total, float(evaluated)))
+            
+            while pending and pending[-1] <= rank + 1:
+                self._store_sweep_point(
+                    pending.pop(), tp_total, evaluated, gs_total,
+                    recalls, precisions
+                )
+            
+            if not active:
+                break # the remaining ranks store the same values
+        
+        while pending:
+            self._store_sweep_point(
+                pending.pop(), tp_total, evaluated, gs_total,
+                recalls, precisions
+            )
+        
+        for i, doc in enumerate(docs):
+            size = min(len(relevance[i]), max_rank)
+            doc.relevance = relevance[i]
+            doc.hits.tp = tps[i]
+            doc.hits.fp = size - tps[i]
+            doc.hits.fn = gs_sizes[i] - tps[i]
+        
+        micro.hits.tp = tp_total
+        micro.hits.fp = evaluated - tp_total
+        micro.hits.fn = gs_total - tp_total
+    
+    def _process_thresholds(self):
+        """Store a SweepPoint for every minimum confidence threshold in the
+        min_conf_sweep list (or every distinct one if it is empty), without
+        evaluating the P/R curves.
+        
+        The results a document has above a threshold are the ones before
+        the running minimum of its confidences drops below it; these minima
+        of all results are sorted once, and the hits are counted up for the
+        thresholds in descending order. The micro scores are those of the
+        evaluation with that min_conf, while the macro averages are kept as
+        running sums (and may differ in the last digits). No Avrg.
+        Precision is calculated (None).
+        """
+        docs = self.secondary_eval.values()
+        relevance = [self._relevance[doc.doi] for doc in docs]
+        gs_sizes = [doc.hits.fn for doc in docs]
+        num_docs = len(docs)
+        recalls = [0.0] * num_docs
+        precisions = [0.0] * num_docs
+        f_scores = [0.0] * num_docs
+        sizes = [0] * num_docs
+        tps = [0] * num_docs
+        minima = []
+        divide = ProteinEvaluation._divide
+        
+        for i, doc in enumerate(docs):
+            confidences = self._confidences(doc.doi)
+            
+            if confidences is None:
+                # no confidences: the results are above any threshold
+                minima.extend([(float('inf'), i)] * len(relevance[i]))
+            else:
+                minimum = float('inf')
+                
+                for confidence in islice(confidences, len(relevance[i])):
+                    minimum = min(minimum, confidence)
+                    minima.append((minimum, i))
+        
+        minima.sort(reverse=True)
+        
+        if self.min_conf_sweep:
+            thresholds = sorted(self.min_conf_sweep, reverse=True)
+        else:
+            thresholds = sorted(
+                set(m for m, i in minima if m != float('inf')), reverse=True
+            )
+        
+        micro = self.primary_eval
+        gs_total = micro.hits.fn
+        tp_total = 0
+        macro_sums = [0.0, 0.0, 0.0] # precision, recall, F-score
+        pos = 0
+        self.sweep = []
+        
+        for threshold in thresholds:
+            while pos < len(minima) and minima[pos][0] >= threshold:
+                i = minima[pos][1]
+                pos += 1
+                hit = relevance[i][sizes[i]]
+                sizes[i] += 1
+                tps[i] += hit
+                tp_total += hit
+                p = tps[i] / float(sizes[i])
+                r = divide(tps[i], float(gs_sizes[i]))
+                f = divide(2.0 * p * r, p + r)
+                macro_sums[0] += p - precisions[i]
+                macro_sums[1] += r - recalls[i]
+                macro_sums[2] += f - f_scores[i]
+                precisions[i], recalls[i], f_scores[i] = p, r, f
+            
+            micro.hits.tp = tp_total
+            micro.hits.fp = pos - tp_total
+            micro.hits.fn = gs_total - tp_total
+            macro_scores = tuple(
+                divide(total, float(num_docs)) for total in macro_sums
+            ) + (None,)
+            self.sweep.append(SweepPoint(
+                threshold, Hits(tp_total, pos - tp_total, micro.hits.fn),
+                (micro.precision, micro.recall, micro.f_score, None),
+                macro_scores
+            ))
+        
+        self.sweep.reverse() # by ascending threshold
+    
+    def _confidences(self, doi):
+        "Return the (sorted) confidences of the DOI's results (or None)."
+        result_items = self.results[doi]
+        
+        if isinstance(result_items, ResultArrays):
+            return result_items.confidences
+        elif len(result_items) and result_items[0].confidence is not None:
+            return [item.confidence for item in result_items]
+        else:
+            return None
+    
+    def _store_sweep_point(self, limit, tp_total, evaluated, gs_total,
+                           recalls, precisions):
+        """Append the current scores as a SweepPoint to the sweep list.
+        
+        The micro hits are set to the current counts, so the micro scores
+        are those of the primary evaluation; the macro scores are averaged
+        from the per-document recall and precision lists.
+        """
+        micro = self.primary_eval
+        macro = self.secondary_eval
+        micro.hits.tp = tp_total
+        micro.hits.fp = evaluated - tp_total
+        micro.hits.fn = gs_total - tp_total
+        divide = ProteinEvaluation._divide
+        num_docs = len(recalls)
+        f_scores = [
+            divide(2.0 * p * r, p + r) for p, r in izip(precisions, recalls)
+        ]
+        
+        if num_docs:
+            macro_scores = (
+                sum(precisions) / num_docs, sum(recalls) / num_docs,
+                sum(f_scores) / num_docs, macro.avrg_p
+            )
+        else:
+            macro_scores = (0.0, 0.0, 0.0, macro.avrg_p)
+        
+        self.sweep.append(SweepPoint(
+            limit, Hits(micro.hits.tp, micro.hits.fp, micro.hits.fn),
+            (micro.precision, micro.recall, micro.f_score, micro.avrg_p),
+            macro_scores
+        ))
+    
+    def _relevance_lists(self):
+        """Return the lists of booleans telling if the (cut) results per DOI
+        are GS items.
+        """
+        relevance = {}
+        
+        for doi in self._dois:
+            if self.gold_standard_index is None:
+                std_items = frozenset(
+                    rc.item for rc in self.gold_standard[doi]
+                )
+            else:
+                std_items = self.gold_standard_index[doi]
+            
+            result_items = self.results[doi]
+            
+            if isinstance(result_items, ResultArrays):
+                relevance[doi] = result_items.relevance(
+                    std_items, self.cutoff, self.min_conf
+                )
+            else:
+                relevance[doi] = self._list_relevance(
+                    result_items, std_items
+                )
+        
+        return relevance
+    
+    def _list_relevance(self, result_list, std_items):
+        """Return the relevance list for a list of ResultContainers, cut as
+        in the reference loop.
+        """
+        relevance = []
+        
+        for item in islice(result_list, self.cutoff or None):
+            if item.confidence is not None and \
+               item.confidence < self.min_conf:
+                break # confidence-base cutoff
+            
+            relevance.append(item.item in std_items)
+        
+        return relevance
+    
     def _process_doi(self, doi, rank):
         """Evaluate the result at a given rank for a document."""
+        if self._relevance is not None:
+            return self._process_relevance(doi, rank)
+        
         result_items = self.results[doi]
-        std_items = self.gold_standard.get(doi) # special syntax for mocking
+        
+        if self.gold_standard_index is None:
+            std_items = self.gold_standard.get(doi) # syntax for mocking
+        else:
+            std_items = self.gold_standard_index[doi]
         
         try:
             item = result_items[rank]
@@ -79,3 +364,17 @@ class ProteinEvaluator(AbstractEvaluator):
                 self.primary_eval.evaluate_item(item, std_items)
                 self.secondary_eval[doi].evaluate_item(item, std_items)
                 self.secondary_eval[doi].store_p_at_current_r()
+    
+    def _process_relevance(self, doi, rank):
+        """Evaluate the result at a given rank for a document using the
+        relevance list of its ResultArrays.
+        """
+        relevance = self._relevance[doi]
+        
+        if rank < len(relevance):
+            self.primary_eval.count_hit(relevance[rank])
+            self.secondary_eval[doi].count_hit(relevance[rank])
+            self.secondary_eval[doi].store_p_at_current_r()
+        else:
+            # no more results (above the confidence cutoff) for this DOI
+            self._dois.remove(doi)
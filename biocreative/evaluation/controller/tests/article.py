@@ -1,3 +1,4 @@
+import random
 import unittest
 
 from mock import Mock, patch
@@ -60,6 +61,57 @@ class ArticleEvaluatorTest(unittest.TestCase):
         for mock in (self.eval.primary_eval, self.eval.secondary_eval):
             self.assert_called_once_with(mock.evaluate, 'a', 'a', 0)
     
+    def test_classification_vectors(self):
+        self.eval.gold_standard = {
+            1: ResultContainer(True), 2: ResultContainer(False)
+        }
+        self.eval.results = ArticleDataDict()
+        self.eval.results.load_from([
+            (1, False, 2, None), (2, True, 1, None), (3, True, 3, None)
+        ])
+        dois, results, gold_standard = self.eval._classification_vectors()
+        self.assertEqual(dois, [2, 1])
+        self.assertEqual(results.tolist(), [1, 0])
+        self.assertEqual(gold_standard.tolist(), [0, 1])
+        self.assertEqual(self.logger_mock.error.call_count, 1)
+        self.eval.gold_standard[1] = ResultContainer('a')
+        self.assertRaises(TypeError, self.eval._classification_vectors)
+    
+    def test_process_vectors_as_reference_loop(self):
+        rand = random.Random(1)
+        gold_standard = ArticleDataDict()
+        gold_standard.load_from(
+            (doi, rand.random() < 0.3, None, None) for doi in range(200)
+        )
+        results = ArticleDataDict()
+        results.load_from(
+            (doi, rand.random() < 0.4, None, round(rand.random(), 2))
+            for doi in range(200) if rand.random() < 0.9
+        )
+        vectors = ArticleEvaluator(0)
+        reference = ArticleEvaluator(0)
+        reference.reference_loop = True
+        
+        for evaluator in (vectors, reference):
+            evaluator.process(results, gold_standard)
+        
+        for name in ('primary_eval', 'secondary_eval'):
+            evaluation = getattr(vectors, name)
+            expected = getattr(reference, name)
+            self.assertEqual(
+                evaluation.precisions_at_recall,
+                expected.precisions_at_recall
+            )
+            self.assertEqual(evaluation.hits.all(), expected.hits.all())
+        
+        self.assertEqual(
+            vectors.primary_eval.auc_pr, reference.primary_eval.auc_pr
+        )
+        self.assertEqual(
+            vectors.secondary_eval.mcc_score,
+            reference.secondary_eval.mcc_score
+        )
+    
     def assert_called_once_with(self, mock, *args, **kwds):
         self.assertEqual(mock.call_count, 1)
         self.assertEqual(mock.call_args, (args, kwds))
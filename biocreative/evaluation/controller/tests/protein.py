@@ -1,3 +1,4 @@
+import random
 import unittest
 
 from mock import Mock, patch
@@ -8,6 +9,8 @@ from biocreative.evaluation.calculation.macro_evaluation \
     import ProteinMacroEvaluation
 from biocreative.evaluation.calculation.protein_evaluation \
     import ProteinEvaluation
+from biocreative.evaluation.container.array_dict \
+    import ProteinArrayDict
 from biocreative.evaluation.container.protein_dict \
     import ProteinDataDict
 from biocreative.evaluation.controller.protein \
@@ -73,6 +76,7 @@ class ProteinEvaluatorTest(unittest.TestCase):
         self.eval.gold_standard = {'a': [1,2,3], 'b': [1,2,3], 'c': [1,2,3]}
         self.eval.results = {'a': [4,5,6], 'b': [4,5,6], 'c': [4,5,6]}
         self.eval.cutoff = 2
+        self.eval.reference_loop = True
         self.eval._process_doi = Mock()
         self.eval.primary_eval.store_p_at_current_r = Mock()
         self.eval.secondary_eval.store_p_at_current_r = Mock()
@@ -118,6 +122,171 @@ class ProteinEvaluatorTest(unittest.TestCase):
         self.assertEqual(protein_eval.hits.fp, 1)
         self.assertEqual(protein_eval.hits.fn, 2)
     
+    def test_process_doi_with_gold_standard_index(self):
+        self.eval.secondary_eval[1] = ProteinEvaluation(1, 3)
+        self.eval.primary_eval = Mock(spec=ProteinEvaluation)
+        self.eval._dois = [1]
+        one = Mock()
+        one.item = 'a'
+        one.confidence = None
+        four = Mock()
+        four.item = 'd'
+        four.confidence = None
+        self.eval.gold_standard = None
+        self.eval.gold_standard_index = {1: frozenset(['a', 'b', 'c'])}
+        self.eval.results = {1: [one, four]}
+        self.eval._process_doi(1, 0)
+        self.eval._process_doi(1, 1)
+        protein_eval = self.eval.secondary_eval[1]
+        self.assertEqual(protein_eval.hits.tp, 1)
+        self.assertEqual(protein_eval.hits.fp, 1)
+        self.assertEqual(protein_eval.hits.fn, 2)
+    
+    def test_process_result_arrays(self):
+        self.eval.cutoff = 3
+        self.eval.min_conf = 0.5
+        gold_standard = ProteinDataDict()
+        gold_standard.load_from([
+            ('a', 'x', None, None), ('a', 'y', None, None),
+            ('b', 'z', None, None),
+        ])
+        results = ProteinArrayDict()
+        results.load_from([
+            ('a', 'x', None, 0.9), ('a', 'w', None, 0.8),
+            ('a', 'y', None, 0.7), ('a', 'v', None, 0.6),
+            ('b', 'z', None, 0.6), ('b', 'u', None, 0.4),
+        ])
+        self.eval.process(
+            results, gold_standard, gold_standard.item_sets()
+        )
+        self.assertEqual(self.eval._relevance, {
+            'a': [True, False, True], 'b': [True]
+        })
+        self.assertEqual(self.eval.secondary_eval['a'].hits.tp, 2)
+        self.assertEqual(self.eval.secondary_eval['a'].hits.fp, 1)
+        self.assertEqual(self.eval.secondary_eval['b'].hits.tp, 1)
+        self.assertEqual(self.eval.secondary_eval['b'].hits.fp, 0)
+        self.assertEqual(self.eval.primary_eval.hits.tp, 3)
+        self.assertEqual(self.eval.primary_eval.hits.fp, 1)
+        self.assertEqual(self.eval.primary_eval.hits.fn, 0)
+    
+    def test_process_curves_as_reference_loop(self):
+        rand = random.Random(1)
+        gold_standard = ProteinDataDict()
+        gold_standard.load_from(
+            ("d%i" % d, "p%i" % p, None, None)
+            for d in range(30) for p in range(rand.randint(1, 6))
+        )
+        rows = [
+            ("d%i" % d, "p%i" % p, None, round(rand.random(), 1))
+            for d in range(30) for p in range(rand.randint(0, 12))
+        ]
+        
+        for Container in (ProteinArrayDict, ProteinDataDict):
+            for cutoff, min_conf in ((0, 0.0), (4, 0.0), (0, 0.3)):
+                results = Container()
+                results.load_from(rows, gold_standard=gold_standard)
+                results.add_entries_only_in(gold_standard)
+                curves = ProteinEvaluator(cutoff, min_conf)
+                reference = ProteinEvaluator(cutoff, min_conf)
+                reference.reference_loop = True
+                
+                for evaluator in (curves, reference):
+                    evaluator.process(
+                        results, gold_standard, gold_standard.item_sets()
+                    )
+                
+                self.assert_same_evaluations(curves, reference)
+    
+    def test_process_cutoff_sweep(self):
+        rand = random.Random(2)
+        gold_standard = ProteinDataDict()
+        gold_standard.load_from(
+            ("d%i" % d, "p%i" % p, None, None)
+            for d in range(20) for p in range(rand.randint(1, 5))
+        )
+        results = ProteinArrayDict()
+        results.load_from(
+            ("d%i" % d, "p%i" % p, None, rand.random())
+            for d in range(20) for p in range(rand.randint(0, 8))
+        )
+        results.add_entries_only_in(gold_standard)
+        sweep = ProteinEvaluator(5)
+        sweep.cutoff_sweep = [1, 2, 5]
+        sweep.process(results, gold_standard, gold_standard.item_sets())
+        self.assertEqual([p.limit for p in sweep.sweep], [1, 2, 5])
+        
+        for point in sweep.sweep:
+            evaluator = ProteinEvaluator(point.limit)
+            micro, macro = evaluator.process(
+                results, gold_standard, gold_standard.item_sets()
+            )
+            self.assertEqual(point.hits.all(), micro.hits.all())
+            self.assertEqual(point.scores(), (
+                macro.precision, macro.recall, macro.f_score, macro.avrg_p,
+                micro.precision, micro.recall, micro.f_score, micro.avrg_p
+            ))
+    
+    def test_process_min_conf_sweep(self):
+        rand = random.Random(3)
+        gold_standard = ProteinDataDict()
+        gold_standard.load_from(
+            ("d%i" % d, "p%i" % p, None, None)
+            for d in range(20) for p in range(rand.randint(1, 5))
+        )
+        
+        for Container in (ProteinArrayDict, ProteinDataDict):
+            # ranked results, so the confidences are not in order
+            results = Container()
+            results.load_from(
+                ("d%i" % d, "p%i" % p, p + 1, round(rand.random(), 1))
+                for d in range(20) for p in range(rand.randint(0, 8))
+            )
+            results.add_entries_only_in(gold_standard)
+            sweep = ProteinEvaluator(6)
+            sweep.min_conf_sweep = []
+            sweep.process(results, gold_standard, gold_standard.item_sets())
+            thresholds = [p.limit for p in sweep.sweep]
+            self.assertEqual(thresholds, sorted(set(thresholds)))
+            
+            for point in sweep.sweep:
+                evaluator = ProteinEvaluator(6, point.limit)
+                micro, macro = evaluator.process(
+                    results, gold_standard, gold_standard.item_sets()
+                )
+                self.assertEqual(point.hits.all(), micro.hits.all())
+                self.assertEqual(
+                    (point.micro_precision, point.micro_recall,
+                     point.micro_f_score),
+                    (micro.precision, micro.recall, micro.f_score)
+                )
+                
+                for name in ('precision', 'recall', 'f_score'):
+                    self.assertAlmostEqual(
+                        getattr(point, 'macro_' + name), getattr(macro, name)
+                    )
+    
+    def assert_same_evaluations(self, evaluator, reference):
+        for name in ('primary_eval', 'secondary_eval'):
+            evaluation = getattr(evaluator, name)
+            expected = getattr(reference, name)
+            self.assertEqual(
+                evaluation.precisions_at_recall,
+                expected.precisions_at_recall
+            )
+            self.assertEqual(evaluation.hits.all(), expected.hits.all())
+            self.assertEqual(evaluation.avrg_p, expected.avrg_p)
+            self.assertEqual(evaluation.f_score, expected.f_score)
+        
+        for doi, doc in reference.secondary_eval.items():
+            self.assertEqual(
+                evaluator.secondary_eval[doi].precisions_at_recall,
+                doc.precisions_at_recall
+            )
+            self.assertEqual(
+                evaluator.secondary_eval[doi].hits.all(), doc.hits.all()
+            )
+    
     def assert_called_once_with(self, mock, *args, **kwds):
         self.assertEqual(mock.call_count, 1)
         self.assertEqual(mock.call_args, (args, kwds))
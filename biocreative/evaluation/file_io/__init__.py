@@ -6,6 +6,11 @@ ACT results are simple boolean flags.
 INT results are strings of the identifier.
 IPT results are ordered tuples of both identifiers.
 
+All readers intern the DOIs and identifiers (and taxonomic IDs) they return,
+so each distinct symbol is stored only once and shared by the gold standard,
+the results, and the homonym ortholog and organism maps; equality checks
+between them (as in dictionary lookups) then reduce to identity checks.
+
 Created by Florian Leitner on 2009-10-21.
 Copyright (c) 2009 CNIO. All rights reserved.
 License: GNU Public License, latest version.
@@ -17,6 +22,10 @@ def result_reader_factory(evaluation_type):
     "Return the appropriate reader for results."
     return class_loader("Result%sReader" % evaluation_type)
 
+def binary_result_reader_factory(evaluation_type):
+    "Return the appropriate reader for binary results."
+    return class_loader("Result%sBinaryReader" % evaluation_type)
+
 def gold_standard_reader_factory(evaluation_type):
     "Return the appropriate reader for the gold standard."
     return class_loader("Gold%sReader" % evaluation_type)
@@ -29,4 +29,22 @@ class BaseReader(object):
         self.line_number += 1
         return line.strip().split(self.field_separator)
     
+    def blocks(self, size_hint):
+        """Iterate over the (raw) lines in the file in blocks of about
+        size_hint bytes each.
+        
+        After each block, line_number is the index of the last line in it.
+        """
+        iter(self)
+        
+        while True:
+            lines = self.handle.readlines(size_hint)
+            
+            if not lines:
+                self.file.close()
+                break
+            
+            self.line_number += len(lines)
+            yield lines
+    
 
@@ -0,0 +1,30 @@
+from itertools import izip, repeat
+
+class ResultBatch(object):
+    """A block of result lines split into parallel columns.
+    
+    The DOI, item, rank, and confidence columns are lists of equal length;
+    the rank or confidence column is None if the file has no such column.
+    Iterating over a batch yields the same (doi, item, rank, confidence)
+    tuples a reader would produce line by line.
+    """
+    
+    def __init__(self, dois, items, ranks=None, confidences=None):
+        self.dois = dois
+        self.items = items
+        self.ranks = ranks
+        self.confidences = confidences
+    
+    def __len__(self):
+        return len(self.dois)
+    
+    def __iter__(self):
+        size = len(self.dois)
+        return izip(
+            self.dois, self.items,
+            repeat(None, size) if self.ranks is None else self.ranks,
+            repeat(None, size) if self.confidences is None
+            else self.confidences
+        )
+    
+
@@ -0,0 +1,277 @@
+import logging
+import struct
+import sys
+
+from array import array
+from itertools import chain, izip
+
+from biocreative.evaluation.file_io.batch import ResultBatch
+from biocreative.evaluation.settings import Defaults, Evaluate
+
+MAGIC = 'BCRESBN1'
+# magic, evaluation type, column flags, number of rows, DOIs, and items
+HEADER = struct.Struct('<8s3sBIII')
+TABLE_SIZE = struct.Struct('<I')
+HAS_RANK = 1
+HAS_CONFIDENCE = 2
+# array type codes of the (little-endian) columns
+INDEX = 'I' if array('I').itemsize == 4 else 'L'
+RANK = 'i' if array('i').itemsize == 4 else 'l'
+CONFIDENCE = 'd' # doubles, so the results are ordered as in the text file
+CLASSIFICATION = 'B'
+# number of item index columns; 0: a classification (boolean) column
+ITEM_COLUMNS = {Evaluate.ACT: 0, Evaluate.INT: 1, Evaluate.IPT: 2}
+
+def _write_column(fh, column):
+    "Write an array column in little-endian byte order."
+    if sys.byteorder == 'big':
+        column.byteswap()
+    
+    column.tofile(fh)
+
+def _read_column(fh, typecode, size):
+    "Read an array column of size values in little-endian byte order."
+    column = array(typecode)
+    column.fromfile(fh, size)
+    
+    if sys.byteorder == 'big':
+        column.byteswap()
+    
+    return column
+
+def _write_table(fh, strings):
+    "Write a table of (newline-free) strings."
+    table = '\n'.join(strings)
+    fh.write(TABLE_SIZE.pack(len(table)))
+    fh.write(table)
+
+def _read_table(fh, size):
+    "Read a table of size strings."
+    table = fh.read(TABLE_SIZE.unpack(fh.read(TABLE_SIZE.size))[0])
+    return map(intern, table.split('\n')) if size else []
+
+def write_binary_results(data_iterator, path, evaluation_type):
+    """Write the (doi, result, rank, confidence) tuples or ResultBatches of
+    a Result*Reader to a binary result file at path.
+    
+    DOIs and identifiers are stored once in a table each and the rows as
+    index columns, together with the rank and confidence columns (if the
+    reader produced them). Returns the number of rows written.
+    """
+    width = ITEM_COLUMNS[evaluation_type]
+    doi_ids, item_ids = {}, {}
+    doi_column = array(INDEX)
+    
+    if width:
+        item_columns = [array(INDEX) for i in range(width)]
+    else:
+        item_columns = [array(CLASSIFICATION)]
+    
+    ranks, confidences = array(RANK), array(CONFIDENCE)
+    
+    for data in data_iterator:
+        rows = data if isinstance(data, ResultBatch) else (data,)
+        
+        for doi, result, rank, confidence in rows:
+            doi_column.append(doi_ids.setdefault(doi, len(doi_ids)))
+            
+            if not width:
+                item_columns[0].append(result)
+            else:
+                for column, item in izip(
+                    item_columns, (result,) if width == 1 else result
+                ):
+                    column.append(item_ids.setdefault(item, len(item_ids)))
+            
+            if rank is not None:
+                ranks.append(rank)
+            
+            if confidence is not None:
+                confidences.append(confidence)
+    
+    size = len(doi_column)
+    flags = 0
+    
+    for flag, column in ((HAS_RANK, ranks), (HAS_CONFIDENCE, confidences)):
+        if len(column) == size and size:
+            flags |= flag
+        elif len(column):
+            raise ValueError("results with and without rank or confidence")
+    
+    fh = open(path, 'wb')
+    
+    try:
+        fh.write(HEADER.pack(
+            MAGIC, evaluation_type, flags, size, len(doi_ids), len(item_ids)
+        ))
+        _write_table(fh, sorted(doi_ids, key=doi_ids.get))
+        _write_table(fh, sorted(item_ids, key=item_ids.get))
+        
+        for column in [doi_column] + item_columns + [ranks, confidences]:
+            _write_column(fh, column)
+    finally:
+        fh.close()
+    
+    logging.getLogger("BinaryResultReader").info(
+        "wrote %i results for %i documents to '%s'" % (
+            size, len(doi_ids), path
+        )
+    )
+    return size
+
+
+class BinaryResultReader(object):
+    """Read a binary result file written by write_binary_results().
+    
+    The columns are loaded as arrays at (almost) I/O speed, without any
+    line splitting or number parsing, and then iterated in ResultBatch
+    blocks just as the text result readers do. The ranks and confidences
+    are stored as read from the text file, so the ordering options and
+    the field separator used for the conversion apply.
+    """
+    
+    evaluation_type = None # set by the implementing classes
+    strict = False
+    
+    def __init__(self, file_path, field_separator=None, result_order=None):
+        self.file = file_path
+        self.logger = logging.getLogger("BinaryResultReader")
+    
+    @staticmethod
+    def is_binary(result_file):
+        "Return True if the result file (store.Files.File) is binary."
+        if result_file.is_stream:
+            return False
+        
+        fh = open(result_file.name, 'rb')
+        
+        try:
+            return fh.read(len(MAGIC)) == MAGIC
+        finally:
+            fh.close()
+    
+    def __iter__(self):
+        return chain.from_iterable(self.batches())
+    
+    def batches(self, size_hint=Defaults.BATCH_SIZE):
+        """Iterate over the results in ResultBatch blocks of about size_hint
+        bytes (of binary data) each.
+        """
+        dois, doi_column, items, item_columns, ranks, confidences = \
+            self._load()
+        row_size = sum(
+            c.itemsize for c in [doi_column] + item_columns + [
+                ranks, confidences
+            ] if c is not None
+        )
+        step = max(1, size_hint // row_size)
+        
+        for start in xrange(0, len(doi_column), step):
+            end = start + step
+            yield ResultBatch(
+                map(dois.__getitem__, doi_column[start:end]),
+                self._items(items, item_columns, start, end),
+                None if ranks is None else ranks[start:end].tolist(),
+                None if confidences is None
+                else confidences[start:end].tolist()
+            )
+    
+    def accessions(self, size_hint=Defaults.BATCH_SIZE):
+        "Return the set of identifiers in the file."
+        fh = open(self.file.name, 'rb')
+        
+        try:
+            header = self._header(fh)
+            _read_table(fh, header[4])
+            return set(_read_table(fh, header[5]))
+        finally:
+            fh.close()
+    
+    def _items(self, items, item_columns, start, end):
+        "Return the result items for the rows from start to end."
+        if not ITEM_COLUMNS[self.evaluation_type]:
+            return map(bool, item_columns[0][start:end])
+        
+        columns = [
+            map(items.__getitem__, c[start:end]) for c in item_columns
+        ]
+        return columns[0] if len(columns) == 1 else zip(*columns)
+    
+    def _header(self, fh):
+        "Read and check the file header."
+        magic, evaluation_type, flags, size, num_dois, num_items = \
+            HEADER.unpack(fh.read(HEADER.size))
+        
+        if magic != MAGIC:
+            raise ValueError(
+                "'%s' is not a binary result file" % self.file.basename
+            )
+        elif evaluation_type != self.evaluation_type:
+            raise ValueError("'%s' holds %s, not %s results" % (
+                self.file.basename, evaluation_type, self.evaluation_type
+            ))
+        
+        return magic, evaluation_type, flags, size, num_dois, num_items
+    
+    def _load(self):
+        "Read the tables and columns of the file."
+        self.logger.info("loading file '%s'" % self.file.basename)
+        fh = open(self.file.name, 'rb')
+        
+        try:
+            unused, unused, flags, size, num_dois, num_items = \
+                self._header(fh)
+            dois = _read_table(fh, num_dois)
+            items = _read_table(fh, num_items)
+            doi_column = _read_column(fh, INDEX, size)
+            width = ITEM_COLUMNS[self.evaluation_type]
+            
+            if width:
+                item_columns = [
+                    _read_column(fh, INDEX, size) for i in range(width)
+                ]
+            else:
+                item_columns = [_read_column(fh, CLASSIFICATION, size)]
+            
+            ranks, confidences = None, None
+            
+            if flags & HAS_RANK:
+                ranks = _read_column(fh, RANK, size)
+            
+            if flags & HAS_CONFIDENCE:
+                confidences = _read_column(fh, CONFIDENCE, size)
+        finally:
+            fh.close()
+        
+        return dois, doi_column, items, item_columns, ranks, confidences
+    
+
+class ResultACTBinaryReader(BinaryResultReader):
+    "Binary article result file reader."
+    
+    evaluation_type = Evaluate.ACT
+    
+    def __init__(self, *args, **kwds):
+        super(ResultACTBinaryReader, self).__init__(*args, **kwds)
+        self.logger = logging.getLogger("ResultACTBinaryReader")
+    
+
+class ResultINTBinaryReader(BinaryResultReader):
+    "Binary normalization result file reader."
+    
+    evaluation_type = Evaluate.INT
+    
+    def __init__(self, *args, **kwds):
+        super(ResultINTBinaryReader, self).__init__(*args, **kwds)
+        self.logger = logging.getLogger("ResultINTBinaryReader")
+    
+
+class ResultIPTBinaryReader(BinaryResultReader):
+    "Binary pair result file reader."
+    
+    evaluation_type = Evaluate.IPT
+    
+    def __init__(self, *args, **kwds):
+        super(ResultIPTBinaryReader, self).__init__(*args, **kwds)
+        self.logger = logging.getLogger("ResultIPTBinaryReader")
+    
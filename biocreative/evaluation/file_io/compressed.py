@@ -0,0 +1,200 @@
+import bz2
+import logging
+import os
+import re
+import threading
+import zlib
+
+from Queue import Queue
+
+def _gzip_decompressor():
+    "zlib decompressor for (gzip) stream data."
+    return zlib.decompressobj(16 + zlib.MAX_WBITS)
+
+def _xz_decompressor():
+    "LZMA decompressor for xz stream data; requires a lzma module."
+    try:
+        import lzma
+    except ImportError:
+        try:
+            from backports import lzma
+        except ImportError:
+            raise IOError("reading xz files requires the lzma module")
+    
+    return lzma.LZMADecompressor()
+
+# magic bytes at the start of the stream: decompressor factory
+DECOMPRESSORS = (
+    ('\x1f\x8b', _gzip_decompressor),
+    ('BZh', bz2.BZ2Decompressor),
+    ('\xfd7zXZ\x00', _xz_decompressor),
+)
+MAGIC_SIZE = max(len(magic) for magic, unused in DECOMPRESSORS)
+EXTENSIONS = ('.gz', '.bz2', '.xz')
+
+def decompressor_for(head):
+    """Return the decompressor factory for a stream starting with the head
+    bytes or None if the stream is not compressed.
+    """
+    for magic, factory in DECOMPRESSORS:
+        if head.startswith(magic):
+            return factory
+    
+    return None
+
+
+class DecompressingReader(object):
+    """Read-only line iterator over a compressed file handle.
+    
+    The raw data is read and decompressed on a background thread that
+    feeds the decompressed blocks through a bounded queue, so
+    decompression overlaps with parsing the lines. Concatenated streams
+    (as written by parallel compressors) are read in sequence.
+    
+    Without a decompressor factory, the data is only read ahead (e.g., to
+    parse a pipe while it is being written). Any head bytes already read
+    from the raw handle are prepended to the data.
+    """
+    
+    CHUNK_SIZE = 1 << 18 # raw bytes read per block
+    QUEUE_SIZE = 16 # decompressed blocks buffered ahead of the reader
+    LINES = re.compile('[^\n]*\n')
+    
+    def __init__(self, raw_handle, decompressor_factory=None, head=''):
+        self.logger = logging.getLogger("DecompressingReader")
+        self._raw = raw_handle
+        self._factory = decompressor_factory
+        self._head = head
+        self._queue = Queue(DecompressingReader.QUEUE_SIZE)
+        self._buffer = ''
+        self._pos = 0
+        self._done = False
+        self._closing = False
+        self._thread = threading.Thread(target=self._decompress)
+        self._thread.setDaemon(True)
+        self._thread.start()
+    
+    def __iter__(self):
+        return self
+    
+    def next(self):
+        line = self.readline()
+        
+        if not line:
+            raise StopIteration
+        
+        return line
+    
+    def readline(self):
+        "Return the next line (or an empty string at the end)."
+        while True:
+            end = self._buffer.find('\n', self._pos) + 1
+            
+            if end:
+                break
+            elif not self._fill():
+                end = len(self._buffer)
+                break
+        
+        line = self._buffer[self._pos:end]
+        self._pos = end
+        return line
+    
+    def readlines(self, size_hint=0):
+        "Return a list of lines with about size_hint bytes (or all)."
+        lines = []
+        size = 0
+        
+        while not size_hint or size < size_hint:
+            end = self._buffer.rfind('\n', self._pos) + 1
+            
+            if end:
+                block = self._buffer[self._pos:end]
+                self._pos = end
+                lines.extend(DecompressingReader.LINES.findall(block))
+                size += len(block)
+            elif not self._fill():
+                if self._pos < len(self._buffer):
+                    lines.append(self._buffer[self._pos:])
+                    self._pos = len(self._buffer)
+                
+                break
+        
+        return lines
+    
+    def close(self):
+        "Stop the decompression thread and close the raw handle."
+        self._closing = True
+        
+        while self._thread.isAlive():
+            self._drain()
+            self._thread.join(0.1)
+        
+        self._raw.close()
+    
+    def _drain(self):
+        "Discard all queued blocks."
+        while not self._queue.empty():
+            self._queue.get()
+    
+    def _fill(self):
+        """Append the next decompressed block to the buffer; return False
+        if there is no more data.
+        """
+        while not self._done:
+            block = self._queue.get()
+            
+            if block is None:
+                self._done = True
+            elif isinstance(block, Exception):
+                self._done = True
+                raise block
+            elif block:
+                self._buffer = self._buffer[self._pos:] + block
+                self._pos = 0
+                return True
+        
+        return False
+    
+    def _decompress(self):
+        "Decompression thread loop."
+        try:
+            decompressor = self._factory and self._factory()
+            fileno = self._raw.fileno()
+            data = self._head
+            
+            while not self._closing:
+                if not data:
+                    # unbuffered, returns as soon as any data is available
+                    data = os.read(fileno, DecompressingReader.CHUNK_SIZE)
+                    
+                    if not data:
+                        break
+                
+                if decompressor is None:
+                    self._queue.put(data)
+                    data = ''
+                else:
+                    try:
+                        block = decompressor.decompress(data)
+                    except EOFError:
+                        # the last stream ended with the previous data, so
+                        # another concatenated stream starts with this one
+                        decompressor = self._factory()
+                        continue
+                    
+                    self._queue.put(block)
+                    data = decompressor.unused_data
+                    
+                    if data:
+                        # another concatenated stream follows
+                        decompressor = self._factory()
+            
+            if hasattr(decompressor, 'flush'):
+                self._queue.put(decompressor.flush())
+            
+            self._queue.put(None)
+        except Exception, ex:
+            self._queue.put(ex)
+    
+
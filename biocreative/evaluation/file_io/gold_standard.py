@@ -10,6 +10,6 @@ class GoldStandardFieldReader(AbstractFieldReader):
                 str(items[1:]), self._at_line_x_in_file_y()
             ))
         
-        return items[0], items[1:], None, None
+        return intern(items[0]), map(intern, items[1:]), None, None
     
 
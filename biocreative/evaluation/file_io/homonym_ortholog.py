@@ -3,20 +3,29 @@ import logging
 from biocreative.evaluation.file_io.base import BaseReader
 
 class HomonymOrthologReader(BaseReader):
-    "Read a homonym ortholog mapping file."
+    """Read a homonym ortholog mapping file.
     
-    def __init__(self, file_path, field_separator):
+    If a set of accessions is given, only the mappings for those (GS)
+    accessions are read.
+    """
+    
+    def __init__(self, file_path, field_separator, accessions=None):
         super(HomonymOrthologReader, self).__init__(
             file_path, field_separator
         )
+        self.accessions = accessions
         self.logger = logging.getLogger("HomonymOrthologReader")
     
     def next(self):
         items = super(HomonymOrthologReader, self).next()
         
+        while self.accessions is not None and \
+              items[0] not in self.accessions:
+            items = super(HomonymOrthologReader, self).next()
+        
         if len(items) == 1:
-            return items[0], list()
+            return intern(items[0]), list()
         
-        return items[0], items[1].split(',')
+        return intern(items[0]), map(intern, items[1].split(','))
     
 
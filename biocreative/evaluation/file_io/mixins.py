@@ -1,3 +1,5 @@
+from itertools import izip
+
 class ACTReaderMixin(object):
     """Extend the FieldReader to return boolean values for the classifcation
     result_list as a Result item.
@@ -10,14 +12,18 @@ class ACTReaderMixin(object):
         [doi, Result, rank, confidence]
         """
         doi, items, rank, confidence = super(ACTReaderMixin, self).next()
-        classification = items[0]
-        
+        return doi, self._content(items), rank, confidence
+    
+    def _content(self, items):
+        "Return the classification in the item list as a boolean."
         try:
-            classification = bool(int(items[0]))
+            return bool(int(items[0]))
         except ValueError:
-            classification = self._map_to_bool(items[0])
-        
-        return doi, classification, rank, confidence
+            return self._map_to_bool(items[0])
+    
+    def _content_column(self, columns):
+        "Return the classification column as a list of booleans."
+        return [self._content(items) for items in izip(*columns)]
     
     def _map_to_bool(self, value):
         "Try to cast a string value to a boolean value."
@@ -43,7 +49,15 @@ class INTReaderMixin(object):
         [doi, Result, rank, confidence]
         """
         doi, items, rank, confidence = super(INTReaderMixin, self).next()
-        return doi, items[0], rank, confidence
+        return doi, self._content(items), rank, confidence
+    
+    def _content(self, items):
+        "Return the identifier in the item list."
+        return items[0]
+    
+    def _content_column(self, columns):
+        "Return the identifier column as a list."
+        return list(columns[0])
     
 
 class IPTReaderMixin(object):
@@ -58,7 +72,17 @@ class IPTReaderMixin(object):
         [doi, Result, rank, confidence]
         """
         doi, items, rank, confidence = super(IPTReaderMixin, self).next()
+        return doi, self._content(items), rank, confidence
+    
+    def _content(self, items):
+        "Return the identifiers in the item list as an ordered pair."
         items.sort()
-        return doi, tuple(items), rank, confidence
+        return tuple(items)
+    
+    def _content_column(self, columns):
+        "Return both identifier columns as a list of ordered pairs."
+        return [
+            (a, b) if a <= b else (b, a) for a, b in izip(*columns)
+        ]
     
 
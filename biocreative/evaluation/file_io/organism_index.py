@@ -0,0 +1,153 @@
+import logging
+import mmap
+import struct
+
+class OrganismIndex(object):
+    """Read-only accession to taxonomic ID mapping on a memory-mapped,
+    compiled index file (see compile_organism_index).
+    
+    Lookups do a binary search over the sorted accessions directly on the
+    mapped file, so opening the index is instantaneous and the pages are
+    shared between concurrent evaluations.
+    
+    File layout (little-endian):
+    header: magic, number of accessions N, number of taxa T, taxa size
+    N + 1 offsets of the accessions (uint64)
+    N taxon positions in the taxa table (uint32)
+    the newline-separated taxa table
+    the concatenated, sorted accessions
+    """
+    
+    MAGIC = 'BCORGIX1'
+    HEADER = struct.Struct('<8sIIQ')
+    OFFSET = struct.Struct('<Q')
+    TAXON = struct.Struct('<I')
+    
+    def __init__(self, path):
+        self.path = path
+        self.logger = logging.getLogger("OrganismIndex")
+        self._fh = open(path, 'rb')
+        self._map = mmap.mmap(
+            self._fh.fileno(), 0, access=mmap.ACCESS_READ
+        )
+        magic, self._size, num_taxa, taxa_size = \
+            OrganismIndex.HEADER.unpack_from(self._map, 0)
+        
+        if magic != OrganismIndex.MAGIC:
+            raise ValueError("'%s' is not an organism index" % path)
+        
+        self._offsets = OrganismIndex.HEADER.size
+        self._taxa = self._offsets + \
+            (self._size + 1) * OrganismIndex.OFFSET.size
+        taxa_start = self._taxa + self._size * OrganismIndex.TAXON.size
+        self._keys = taxa_start + taxa_size
+        taxa = self._map[taxa_start:self._keys]
+        self._taxon_names = map(intern, taxa.split('\n')) if num_taxa else []
+        self.logger.info("opened index of %i accessions for %i taxa" % (
+            self._size, num_taxa
+        ))
+    
+    @staticmethod
+    def is_index(path):
+        "Return True if the file at path is a compiled organism index."
+        fh = open(path, 'rb')
+        
+        try:
+            return fh.read(len(OrganismIndex.MAGIC)) == OrganismIndex.MAGIC
+        finally:
+            fh.close()
+    
+    def __len__(self):
+        return self._size
+    
+    def __contains__(self, accession):
+        return self._find(accession) is not None
+    
+    has_key = __contains__
+    
+    def __getitem__(self, accession):
+        pos = self._find(accession)
+        
+        if pos is None:
+            raise KeyError(accession)
+        
+        taxon, = OrganismIndex.TAXON.unpack_from(
+            self._map, self._taxa + pos * OrganismIndex.TAXON.size
+        )
+        return self._taxon_names[taxon]
+    
+    def get(self, accession, default=None):
+        try:
+            return self[accession]
+        except KeyError:
+            return default
+    
+    def close(self):
+        "Release the memory map and the file handle."
+        self._map.close()
+        self._fh.close()
+    
+    def _key(self, pos):
+        "Return the accession at the given position."
+        start, end = struct.unpack_from(
+            '<QQ', self._map, self._offsets + pos * OrganismIndex.OFFSET.size
+        )
+        return self._map[self._keys + start:self._keys + end]
+    
+    def _find(self, accession):
+        "Binary search for the accession's position (or None)."
+        low, high = 0, self._size
+        
+        while low < high:
+            mid = (low + high) // 2
+            key = self._key(mid)
+            
+            if key < accession:
+                low = mid + 1
+            elif key > accession:
+                high = mid
+            else:
+                return mid
+        
+        return None
+    
+
+def compile_organism_index(pairs, path):
+    """Write an OrganismIndex file to path from an iterable of accession,
+    taxonomic ID pairs (e.g., a ProteinOrganismReader).
+    
+    Later pairs for the same accession replace earlier ones, as when
+    reading the pairs into a dict. Returns the number of accessions.
+    """
+    mapping = dict(pairs)
+    accessions = mapping.keys()
+    accessions.sort()
+    taxon_names = list(set(mapping.values()))
+    taxon_names.sort()
+    taxon_positions = dict((t, i) for i, t in enumerate(taxon_names))
+    taxa = '\n'.join(taxon_names)
+    fh = open(path, 'wb')
+    
+    try:
+        fh.write(OrganismIndex.HEADER.pack(
+            OrganismIndex.MAGIC, len(accessions), len(taxon_names), len(taxa)
+        ))
+        offset = 0
+        fh.write(OrganismIndex.OFFSET.pack(offset))
+        
+        for acc in accessions:
+            offset += len(acc)
+            fh.write(OrganismIndex.OFFSET.pack(offset))
+        
+        for acc in accessions:
+            fh.write(OrganismIndex.TAXON.pack(taxon_positions[mapping[acc]]))
+        
+        fh.write(taxa)
+        fh.write(''.join(accessions))
+    finally:
+        fh.close()
+    
+    logging.getLogger("OrganismIndex").info(
+        "compiled index of %i accessions to '%s'" % (len(accessions), path)
+    )
+    return len(accessions)
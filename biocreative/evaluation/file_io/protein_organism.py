@@ -3,12 +3,26 @@ import logging
 from biocreative.evaluation.file_io.base import BaseReader
 
 class ProteinOrganismReader(BaseReader):
-    "Read a accession to taxonomic ID mapping file."
+    """Read a accession to taxonomic ID mapping file.
     
-    def __init__(self, file_path, field_separator):
+    If a set of accessions is given, only the taxonomic IDs for those
+    accessions are read.
+    """
+    
+    def __init__(self, file_path, field_separator, accessions=None):
         super(ProteinOrganismReader, self).__init__(
             file_path, field_separator
         )
+        self.accessions = accessions
         self.logger = logging.getLogger("ProteinOrganismReader")
     
+    def next(self):
+        items = super(ProteinOrganismReader, self).next()
+        
+        while self.accessions is not None and \
+              items[0] not in self.accessions:
+            items = super(ProteinOrganismReader, self).next()
+        
+        return map(intern, items)
+    
 
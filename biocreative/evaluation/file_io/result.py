@@ -1,4 +1,6 @@
 from biocreative.evaluation.file_io.abstract import AbstractFieldReader
+from biocreative.evaluation.file_io.batch import ResultBatch
+from biocreative.evaluation.settings import Defaults
 
 class ResultFieldReader(AbstractFieldReader):
     "Read lines for the result file."
@@ -7,11 +9,7 @@ class ResultFieldReader(AbstractFieldReader):
     
     def result_scores(self, items):
         "Read confidence and rank according to ordering."
-        total_columns = self.content_items + 1 # plus doi
-        if self.ordering % 10 == 1:
-            total_columns += 1 # plus confidence
-        if self.ordering % 100 >= 10:
-            total_columns += 1 # plus rank
+        total_columns = self._total_columns()
         
         # report missing columns (any mode)
         # report additional columns (strict mode)
@@ -31,8 +29,8 @@ class ResultFieldReader(AbstractFieldReader):
             items = items[:total_columns]
         
         items, rank, confidence = self._extract_rank_and_confidence(items)
-        doi = items[0]
-        items = items[1:]
+        doi = intern(items[0])
+        items = map(intern, items[1:])
         
         assert not (rank is None and confidence is None), \
             "both rank and confidence undefined %s" % \
@@ -56,4 +54,108 @@ class ResultFieldReader(AbstractFieldReader):
         
         return items, rank, confidence
     
-
+    def batches(self, size_hint=Defaults.BATCH_SIZE):
+        """Iterate over the file in ResultBatch blocks of about size_hint
+        bytes each, splitting every block into columns in one pass.
+        
+        Blocks with lines that do not have exactly the expected columns or
+        have an illegal rank or confidence are parsed line by line instead,
+        reporting the same messages and errors as next() would.
+        """
+        for lines in self.blocks(size_hint):
+            batch = self._split_block(lines)
+            
+            if batch is None:
+                batch = self._parse_block(lines)
+            
+            yield batch
+    
+    def accessions(self, size_hint=Defaults.BATCH_SIZE):
+        """Return the set of identifiers in the item columns of the file.
+        
+        The lines are only split, not parsed; ranks and confidences are not
+        checked.
+        """
+        separator = self.field_separator
+        end = self.content_items + 1
+        accessions = set()
+        
+        for lines in self.blocks(size_hint):
+            for line in lines:
+                accessions.update(line.strip().split(separator)[1:end])
+        
+        return accessions
+    
+    def _total_columns(self):
+        "Return the number of columns expected according to ordering."
+        total_columns = self.content_items + 1 # plus doi
+        if self.ordering % 10 == 1:
+            total_columns += 1 # plus confidence
+        if self.ordering % 100 >= 10:
+            total_columns += 1 # plus rank
+        
+        return total_columns
+    
+    def _split_block(self, lines):
+        """Return a ResultBatch for a block of well-formed lines or None if
+        any line in the block needs to be parsed individually.
+        """
+        separator = self.field_separator
+        total_columns = self._total_columns()
+        rows = [line.strip().split(separator) for line in lines]
+        
+        if any(len(row) != total_columns for row in rows):
+            return None
+        
+        columns = zip(*rows)
+        end = total_columns
+        rank, confidence = None, None
+        
+        try:
+            if self.ordering % 10 == 1:
+                end -= 1
+                confidence = map(float, columns[end])
+                
+                if not all(0.0 < c <= 1.0 for c in confidence):
+                    return None
+            
+            if self.ordering % 100 >= 10:
+                end -= 1
+                rank = map(int, columns[end])
+                
+                if min(rank) <= 0:
+                    return None
+            
+            items = self._content_column(
+                [map(intern, column) for column in columns[1:end]]
+            )
+        except (ValueError, RuntimeError):
+            return None
+        
+        if self.ordering >= 100:
+            rank = range(self.line_number - len(lines) + 2,
+                         self.line_number + 2)
+        
+        if rank is None and confidence is None:
+            return None
+        
+        return ResultBatch(map(intern, columns[0]), items, rank, confidence)
+    
+    def _parse_block(self, lines):
+        "Return a ResultBatch for a block, parsing it line by line."
+        separator = self.field_separator
+        last_line = self.line_number
+        batch = ResultBatch([], [], [], [])
+        
+        for offset, line in enumerate(lines):
+            self.line_number = last_line - len(lines) + offset + 1
+            doi, items, rank, confidence = self.result_scores(
+                line.strip().split(separator)
+            )
+            batch.dois.append(doi)
+            batch.items.append(self._content(items))
+            batch.ranks.append(rank)
+            batch.confidences.append(confidence)
+        
+        return batch
+    
@@ -1,4 +1,10 @@
 import os
+import sys
+
+from biocreative.evaluation.file_io.compressed import \
+    DecompressingReader, EXTENSIONS, MAGIC_SIZE, decompressor_for
+
+STDIN = '-' # the file name used for reading from STDIN
 
 class Files(object):
     "File handles and path names storage object."
@@ -19,9 +25,30 @@ class Files(object):
             return repr(self.name)
         
         def open(self, mode='r'):
-            "Open FH if it is a named handle."
-            if isinstance(self.name, str):
+            """Open FH if it is a named handle.
+            
+            Files compressed with gzip, bzip2, or xz are detected by their
+            magic bytes when reading and decompressed on the fly. STDIN
+            ("-") and named pipes are read ahead on a background thread as
+            the data arrives.
+            """
+            if self.name == STDIN and 'r' in mode:
+                self._fh = self._read_ahead(sys.stdin)
+            elif isinstance(self.name, str):
                 self._fh = open(self.name, mode=mode)
+                
+                if 'r' in mode and not os.path.isfile(self.name):
+                    self._fh = self._read_ahead(self._fh)
+                elif 'r' in mode:
+                    decompressor = decompressor_for(self._fh.read(MAGIC_SIZE))
+                    
+                    if decompressor is None:
+                        self._fh.seek(0)
+                    else:
+                        self._fh.close()
+                        self._fh = DecompressingReader(
+                            open(self.name, mode='rb'), decompressor
+                        )
             else:
                 self._fh = self.name
             
@@ -32,21 +59,62 @@ class Files(object):
             if isinstance(self.name, str):
                 self._fh.close()
         
+        @property
+        def is_stream(self):
+            """True if the file can only be read once (STDIN, named pipes,
+            and open handles).
+            """
+            if isinstance(self.name, str):
+                return self.name == STDIN or not os.path.isfile(self.name)
+            else:
+                return True
+        
         @property
         def basename(self):
             "Return the basename of this file."
-            if isinstance(self.name, str):
+            if self.name == STDIN:
+                return "stdin"
+            elif isinstance(self.name, str):
                 return os.path.basename(self.name)
             else:
                 return "%s stream" % self.name.__class__.__name__
         
         @property
         def rootname(self):
-            "Return the root name of this file without extension."
-            if isinstance(self.name, str):
-                return os.path.splitext(self.basename)[0]
+            """Return the root name of this file without extension (and
+            without the compression extension, if any).
+            """
+            if self.name == STDIN:
+                return "stdin"
+            elif isinstance(self.name, str):
+                root, extension = os.path.splitext(self.basename)
+                
+                if extension in EXTENSIONS:
+                    root = os.path.splitext(root)[0]
+                
+                return root
             else:
                 return "stream"
+        
+        def _read_ahead(self, raw_handle):
+            """Return a reader for a (possibly compressed) stream that is
+            read ahead on a background thread.
+            """
+            fileno = raw_handle.fileno()
+            head = ''
+            
+            # the unbuffered reads in a pipe can be shorter than requested
+            while len(head) < MAGIC_SIZE:
+                data = os.read(fileno, MAGIC_SIZE - len(head))
+                
+                if not data:
+                    break
+                
+                head += data
+            
+            return DecompressingReader(
+                raw_handle, decompressor_for(head), head
+            )
     
     def __init__(self, **paths):
         """Set up the File objects - defaults to None."""
@@ -0,0 +1,161 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from biocreative.evaluation.file_io.batch import ResultBatch
+from biocreative.evaluation.file_io.binary import BinaryResultReader, \
+    ResultACTBinaryReader, ResultINTBinaryReader, ResultIPTBinaryReader, \
+    write_binary_results
+from biocreative.evaluation.file_io.readers import ResultINTReader
+from biocreative.evaluation.file_io.store import Files
+from biocreative.evaluation.settings import Evaluate
+
+ACT_ROWS = [
+    ('doi1', True, 1, 0.9), ('doi2', False, 2, 0.4), ('doi3', True, 3, 0.1)
+]
+INT_ROWS = [
+    ('doi2', 'P2', 1, 0.75), ('doi2', 'P1', 2, 0.5),
+    ('doi1', 'P1', 1, 1.0 / 3), ('doi3', 'P3', 1, None)
+]
+IPT_ROWS = [
+    ('doi1', ('P1', 'P2'), 1, None), ('doi1', ('P3', 'P1'), 2, None),
+    ('doi2', ('P2', 'P1'), 1, None)
+]
+
+
+class BinaryTestCase(unittest.TestCase):
+    
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'results.bin')
+    
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+    
+    def write(self, data, evaluation_type):
+        return write_binary_results(data, self.path, evaluation_type)
+    
+    def write_text(self, name, text):
+        path = os.path.join(self.directory, name)
+        fh = open(path, 'w')
+        fh.write(text)
+        fh.close()
+        return path
+    
+    def read(self, reader_class, **kwds):
+        reader = reader_class(Files.File(self.path), '\t', 110)
+        return [list(b) for b in reader.batches(**kwds)]
+    
+
+class BinaryResultReaderTest(BinaryTestCase):
+    
+    def test_is_binary(self):
+        self.write(INT_ROWS[:3], Evaluate.INT)
+        text = self.write_text('results.tsv', "doi1\tP1\t1\t0.5\n")
+        self.assertTrue(BinaryResultReader.is_binary(Files.File(self.path)))
+        self.assertFalse(BinaryResultReader.is_binary(Files.File(text)))
+    
+    def test_write_returns_the_row_count(self):
+        self.assertEqual(self.write(INT_ROWS[:3], Evaluate.INT), 3)
+    
+    def test_batches_and_tuples(self):
+        self.write([ResultBatch(
+            [r[0] for r in INT_ROWS[:2]], [r[1] for r in INT_ROWS[:2]],
+            [r[2] for r in INT_ROWS[:2]], [r[3] for r in INT_ROWS[:2]]
+        ), INT_ROWS[2]], Evaluate.INT)
+        self.assertEqual(
+            list(ResultINTBinaryReader(Files.File(self.path))),
+            INT_ROWS[:3]
+        )
+    
+    def test_small_batches(self):
+        self.write(INT_ROWS[:3], Evaluate.INT)
+        batches = self.read(ResultINTBinaryReader, size_hint=1)
+        self.assertEqual(len(batches), 3)
+        self.assertEqual(sum(batches, []), INT_ROWS[:3])
+    
+    def test_partial_confidences(self):
+        self.assertRaises(ValueError, self.write, INT_ROWS, Evaluate.INT)
+    
+    def test_text_round_trip(self):
+        text = self.write_text('results.tsv', "".join(
+            "%s\t%s\t%i\t%s\n" % r for r in INT_ROWS[:3]
+        ))
+        expected = list(ResultINTReader(Files.File(text), '\t', 110))
+        self.write(
+            ResultINTReader(Files.File(text), '\t', 110).batches(),
+            Evaluate.INT
+        )
+        self.assertEqual(sum(self.read(ResultINTBinaryReader), []), expected)
+    
+    def test_foreign_file(self):
+        self.path = self.write_text('results.tsv', "doi1\tP1\t1\t0.5\n" * 9)
+        self.assertRaises(ValueError, self.read, ResultINTBinaryReader)
+    
+    def test_wrong_evaluation_type(self):
+        self.write(INT_ROWS[:3], Evaluate.INT)
+        self.assertRaises(ValueError, self.read, ResultIPTBinaryReader)
+    
+    def test_truncated_file(self):
+        self.write(INT_ROWS[:3], Evaluate.INT)
+        size = os.path.getsize(self.path)
+        fh = open(self.path, 'r+b')
+        fh.truncate(size - 1)
+        fh.close()
+        self.assertRaises(EOFError, self.read, ResultINTBinaryReader)
+    
+
+class ResultACTBinaryReaderTest(BinaryTestCase):
+    
+    def test_round_trip(self):
+        self.write(ACT_ROWS, Evaluate.ACT)
+        self.assertEqual(sum(self.read(ResultACTBinaryReader), []), ACT_ROWS)
+    
+    def test_accessions(self):
+        self.write(ACT_ROWS, Evaluate.ACT)
+        reader = ResultACTBinaryReader(Files.File(self.path))
+        self.assertEqual(reader.accessions(), set())
+    
+
+class ResultINTBinaryReaderTest(BinaryTestCase):
+    
+    def test_round_trip(self):
+        rows = INT_ROWS[:3]
+        self.write(rows, Evaluate.INT)
+        self.assertEqual(sum(self.read(ResultINTBinaryReader), []), rows)
+    
+    def test_without_confidences(self):
+        rows = [(d, i, r, None) for d, i, r, c in INT_ROWS]
+        self.write(rows, Evaluate.INT)
+        self.assertEqual(sum(self.read(ResultINTBinaryReader), []), rows)
+    
+    def test_accessions(self):
+        self.write(INT_ROWS[:3], Evaluate.INT)
+        reader = ResultINTBinaryReader(Files.File(self.path))
+        self.assertEqual(reader.accessions(), set(['P1', 'P2']))
+    
+    def test_empty_file(self):
+        self.write([], Evaluate.INT)
+        self.assertEqual(self.read(ResultINTBinaryReader), [])
+    
+
+class ResultIPTBinaryReaderTest(BinaryTestCase):
+    
+    def test_round_trip(self):
+        self.write(IPT_ROWS, Evaluate.IPT)
+        self.assertEqual(sum(self.read(ResultIPTBinaryReader), []), IPT_ROWS)
+    
+    def test_pair_order(self):
+        self.write(IPT_ROWS, Evaluate.IPT)
+        pairs = [r[1] for r in sum(self.read(ResultIPTBinaryReader), [])]
+        self.assertEqual(pairs, [('P1', 'P2'), ('P3', 'P1'), ('P2', 'P1')])
+    
+    def test_accessions(self):
+        self.write(IPT_ROWS, Evaluate.IPT)
+        reader = ResultIPTBinaryReader(Files.File(self.path))
+        self.assertEqual(reader.accessions(), set(['P1', 'P2', 'P3']))
+    
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+import bz2
+import tempfile
+import unittest
+import zlib
+
+from biocreative.evaluation.file_io.compressed import DecompressingReader, \
+    decompressor_for
+
+LINES = ["doi%i\tP%05i\t%i\t0.5\n" % (i % 7, i, i) for i in range(500)]
+
+def gzip_compress(data):
+    compressor = zlib.compressobj(9, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush()
+
+def raw_handle(data):
+    handle = tempfile.TemporaryFile()
+    handle.write(data)
+    handle.seek(0)
+    return handle
+
+
+class FailingDecompressor(object):
+    
+    def decompress(self, data):
+        raise IOError("invalid data")
+    
+
+class DecompressingReaderTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.chunk_size = DecompressingReader.CHUNK_SIZE
+        self.data = "".join(LINES)
+    
+    def tearDown(self):
+        DecompressingReader.CHUNK_SIZE = self.chunk_size
+    
+    def read(self, compressed, factory=None, head=''):
+        reader = DecompressingReader(raw_handle(compressed), factory, head)
+        
+        try:
+            return list(reader)
+        finally:
+            reader.close()
+    
+    def test_decompressor_for(self):
+        self.assertEqual(decompressor_for(self.data[:6]), None)
+        self.assertEqual(
+            decompressor_for(bz2.compress(self.data)[:6]),
+            bz2.BZ2Decompressor
+        )
+        self.assertNotEqual(
+            decompressor_for(gzip_compress(self.data)[:6]), None
+        )
+    
+    def test_plain_data(self):
+        DecompressingReader.CHUNK_SIZE = 100
+        self.assertEqual(self.read(self.data), LINES)
+    
+    def test_plain_data_with_head(self):
+        self.assertEqual(
+            self.read(self.data[6:], head=self.data[:6]), LINES
+        )
+    
+    def test_gzip(self):
+        compressed = gzip_compress(self.data)
+        self.assertEqual(
+            self.read(compressed, decompressor_for(compressed)), LINES
+        )
+    
+    def test_bz2(self):
+        compressed = bz2.compress(self.data)
+        self.assertEqual(
+            self.read(compressed, decompressor_for(compressed)), LINES
+        )
+    
+    def test_readlines(self):
+        DecompressingReader.CHUNK_SIZE = 100
+        reader = DecompressingReader(raw_handle(self.data))
+        lines = reader.readlines(1000)
+        self.assertTrue(0 < len(lines) < len(LINES))
+        self.assertEqual(lines + reader.readlines(), LINES)
+        reader.close()
+    
+    def test_concatenated_streams(self):
+        middle = len(self.data) // 2
+        
+        for compress in (gzip_compress, bz2.compress):
+            first = compress(self.data[:middle])
+            compressed = first + compress(self.data[middle:])
+            factory = decompressor_for(compressed)
+            
+            # streams ending at, before, and after the end of a read
+            for chunk_size in (len(first), len(first) - 7, len(first) + 7):
+                DecompressingReader.CHUNK_SIZE = chunk_size
+                self.assertEqual(
+                    "".join(self.read(compressed, factory)), self.data
+                )
+    
+    def test_many_concatenated_streams(self):
+        compressed = "".join(bz2.compress(line) for line in LINES)
+        
+        for chunk_size in (len(bz2.compress(LINES[0])), 13, 1 << 18):
+            DecompressingReader.CHUNK_SIZE = chunk_size
+            self.assertEqual(
+                self.read(compressed, bz2.BZ2Decompressor), LINES
+            )
+    
+    def test_thread_errors_reach_the_reader(self):
+        reader = DecompressingReader(
+            raw_handle(self.data), FailingDecompressor
+        )
+        self.assertRaises(IOError, list, reader)
+        reader.close()
+    
+    def test_close_before_the_end(self):
+        DecompressingReader.CHUNK_SIZE = 10
+        DecompressingReader.QUEUE_SIZE, queue_size = 2, \
+            DecompressingReader.QUEUE_SIZE
+        
+        try:
+            reader = DecompressingReader(raw_handle(self.data))
+            self.assertEqual(reader.readline(), LINES[0])
+            reader.close()
+            self.assertFalse(reader._thread.isAlive())
+        finally:
+            DecompressingReader.QUEUE_SIZE = queue_size
+    
+
+if __name__ == '__main__':
+    unittest.main()
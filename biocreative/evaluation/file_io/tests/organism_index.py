@@ -0,0 +1,94 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from biocreative.evaluation.file_io.organism_index import OrganismIndex, \
+    compile_organism_index
+from biocreative.evaluation.file_io.protein_organism import \
+    ProteinOrganismReader
+from biocreative.evaluation.file_io.store import Files
+
+PAIRS = [
+    ('Q9Y6K9', '9606'), ('P12345', '10090'), ('A0A000', '9606'),
+    ('P1', '7227'), ('P12', '4932'), ('Z9Z9Z9', '10090')
+]
+
+
+class OrganismIndexTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'organisms.idx')
+        self.tsv = os.path.join(self.directory, 'organisms.tsv')
+        fh = open(self.tsv, 'w')
+        fh.write("".join("%s\t%s\n" % pair for pair in PAIRS))
+        fh.close()
+        self.indexes = []
+    
+    def tearDown(self):
+        for index in self.indexes:
+            index.close()
+        
+        shutil.rmtree(self.directory)
+    
+    def compile(self, pairs):
+        self.size = compile_organism_index(pairs, self.path)
+        index = OrganismIndex(self.path)
+        self.indexes.append(index)
+        return index
+    
+    def test_lookups(self):
+        index = self.compile(PAIRS)
+        accessions = sorted(dict(PAIRS))
+        
+        # the first, a middle, and the last accession in the index
+        for acc in (accessions[0], accessions[2], accessions[-1]):
+            self.assertEqual(index[acc], dict(PAIRS)[acc])
+            self.assertTrue(acc in index)
+        
+        self.assertEqual(len(index), len(PAIRS))
+        self.assertEqual(self.size, len(PAIRS))
+    
+    def test_missing_accessions(self):
+        index = self.compile(PAIRS)
+        
+        # before, between, and after the accessions and a prefix of one
+        for acc in ('0', 'P11', 'ZZ', 'P123'):
+            self.assertRaises(KeyError, index.__getitem__, acc)
+            self.assertFalse(acc in index)
+            self.assertEqual(index.get(acc, 'none'), 'none')
+    
+    def test_later_pairs_replace_earlier_ones(self):
+        index = self.compile(PAIRS + [('P1', '9606')])
+        self.assertEqual(index['P1'], '9606')
+        self.assertEqual(self.size, len(PAIRS))
+    
+    def test_empty_index(self):
+        index = self.compile([])
+        self.assertEqual(len(index), 0)
+        self.assertRaises(KeyError, index.__getitem__, 'P1')
+    
+    def test_is_index(self):
+        self.compile(PAIRS)
+        self.assertTrue(OrganismIndex.is_index(self.path))
+        self.assertFalse(OrganismIndex.is_index(self.tsv))
+    
+    def test_plain_map_is_rejected(self):
+        self.assertRaises(ValueError, OrganismIndex, self.tsv)
+    
+    def test_equals_the_reader_mapping(self):
+        reader = ProteinOrganismReader(Files.File(self.tsv), '\t')
+        expected = dict(reader)
+        index = self.compile(
+            ProteinOrganismReader(Files.File(self.tsv), '\t')
+        )
+        self.assertEqual(len(expected), len(PAIRS))
+        self.assertEqual(len(index), len(expected))
+        
+        for acc, taxon in expected.items():
+            self.assertEqual(index[acc], taxon)
+    
+
+if __name__ == '__main__':
+    unittest.main()
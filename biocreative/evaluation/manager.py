@@ -1,8 +1,18 @@
 # encoding: utf-8
 
+import cPickle
+import hashlib
+import logging
+import os
+import tempfile
+
+from biocreative.evaluation.calculation import bootstrap_factory, \
+    randomization_factory
 from biocreative.evaluation.container import container_factory
+from biocreative.evaluation.container.view import DataDictView
 from biocreative.evaluation.controller import controller_factory
 from biocreative.evaluation.map_filter import map_filter_factory
+from biocreative.evaluation.settings import Evaluate
 
 class Manager(object):
     """Needs an initial set up after which a Manager instance can run
@@ -10,6 +20,11 @@ class Manager(object):
     parameters (provided by the parameters.Parameters class).
     """
     
+    # change to invalidate all cached gold standard snapshots
+    CACHE_VERSION = 1
+    # HOF is done in parallel for result sets of at least that many results
+    PARALLEL_HOF_RESULTS = 100000
+    
     def __init__(self, evaluation_type):
         """Initial setup only requires the evaluation type (ACT, INT, IPT) is
         set; the gold standard is initialized (but empty!), and the homonym
@@ -19,13 +34,155 @@ class Manager(object):
         self.evaluation_type = evaluation_type
         self.GS_Container = container_factory(evaluation_type)
         self.gold_standard = self.GS_Container()
+        self.gold_standard_index = None
         self.Result_Container = container_factory(evaluation_type)
+        # results are evaluated from arrays unless HOF or debugging is done
+        self.Array_Container = container_factory(evaluation_type, arrays=True)
         self.ho_map = None
+        self.ho_index = None
         self.po_map = None
+        self.gs_taxa = None
+        self.hof_jobs = 1
+        self.cache_dir = None
+        self.logger = logging.getLogger("Manager")
+    
+    def cache_gold_standard_in(self, cache_dir):
+        """Set the directory to store prepared gold standard snapshots in,
+        making use of it in subsequent calls to load_gold_standard().
+        """
+        self.cache_dir = cache_dir
     
     def load_gold_standard(self, gs_iterator):
-        """Load the gold standard from the given data iterator."""
-        self.gold_standard.load_from(gs_iterator)
+        """Load the gold standard from the given data iterator.
+        
+        If a cache directory is set and the iterator is a reader on a named
+        file, the prepared gold standard is loaded from a snapshot keyed by
+        the file's content hash and the evaluation type, or the snapshot is
+        written after loading the file if there is none yet.
+        
+        For INT and IPT, the GS items are indexed as a frozen set per DOI
+        for the evaluations.
+        """
+        cache_file = self._gold_standard_cache_file(gs_iterator)
+        restored = False
+        
+        if cache_file is not None and os.path.exists(cache_file):
+            try:
+                self._restore_gold_standard(cache_file)
+                restored = True
+            except Exception, ex:
+                self.logger.warning("ignoring GS cache file '%s': %s" % (
+                    cache_file, str(ex)
+                ))
+                self.gold_standard = self.GS_Container()
+        
+        if not restored:
+            self.gold_standard.load_from(gs_iterator)
+            
+            if cache_file is not None:
+                self._store_gold_standard(cache_file)
+        
+        if self.evaluation_type != Evaluate.ACT:
+            self.gold_standard_index = self.gold_standard.item_sets()
+        
+        if self.ho_map is not None:
+            self._index_homonym_orthologs()
+        
+        if self.po_map is not None:
+            self._index_organisms()
+    
+    def _gold_standard_cache_file(self, gs_iterator):
+        """Return the path of the GS snapshot for the iterator, or None if
+        there is no cache directory or the GS is not read from a regular
+        file (hashing a stream, e.g. a named pipe, would consume it).
+        """
+        gs_file = getattr(gs_iterator, 'file', None)
+        
+        if self.cache_dir is None or \
+           not isinstance(getattr(gs_file, 'name', None), str) or \
+           gs_file.is_stream:
+            return None
+        
+        digest = hashlib.sha1()
+        fh = open(gs_file.name, 'rb')
+        
+        try:
+            for block in iter(lambda: fh.read(1 << 20), ''):
+                digest.update(block)
+        finally:
+            fh.close()
+        
+        return os.path.join(self.cache_dir, "%s.%s.v%i.gs" % (
+            digest.hexdigest(), self.evaluation_type, Manager.CACHE_VERSION
+        ))
+    
+    def _restore_gold_standard(self, cache_file):
+        "Load the gold standard from a snapshot file."
+        fh = open(cache_file, 'rb')
+        
+        try:
+            rows = cPickle.load(fh)
+        finally:
+            fh.close()
+        
+        self.gold_standard.restore(rows)
+        self.logger.info("loaded GS snapshot '%s'" % cache_file)
+    
+    def _store_gold_standard(self, cache_file):
+        """Write the gold standard snapshot file (atomically, so concurrent
+        runs never see partial snapshots).
+        """
+        try:
+            if not os.path.isdir(self.cache_dir):
+                os.makedirs(self.cache_dir)
+            
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir)
+            fh = os.fdopen(fd, 'wb')
+            
+            try:
+                cPickle.dump(
+                    self.gold_standard.snapshot(), fh, cPickle.HIGHEST_PROTOCOL
+                )
+            finally:
+                fh.close()
+            
+            os.rename(tmp_path, cache_file)
+        except (IOError, OSError), ex:
+            self.logger.warning("could not write GS cache file '%s': %s" % (
+                cache_file, str(ex)
+            ))
+        else:
+            self.logger.info("wrote GS snapshot '%s'" % cache_file)
+    
+    def gold_standard_accessions(self):
+        """Return the set of all accessions in the gold standard."""
+        accessions = set()
+        
+        for result_list in self.gold_standard.values():
+            for result_container in result_list:
+                item = result_container.item
+                
+                if isinstance(item, tuple):
+                    accessions.update(item)
+                else:
+                    accessions.add(item)
+        
+        return accessions
+    
+    def collect_accessions(self, result_readers):
+        """Return the set of all accessions in the gold standard and in the
+        given result file readers.
+        
+        Only these accessions are ever looked up in the homonym ortholog
+        and protein organism maps, so the maps can be restricted to them
+        while reading (see HomonymOrthologReader, ProteinOrganismReader).
+        """
+        accessions = self.gold_standard_accessions()
+        
+        for reader in result_readers:
+            accessions.update(reader.accessions())
+        
+        return accessions
     
     def do_homonym_ortholog_mapping(self, mapping_dict):
         """Set the mapping dictionary for homonym orthologs, making use of
@@ -33,6 +190,13 @@ class Manager(object):
         """
         self.ho_map = mapping_dict
         self._set_hof_containers()
+        self._index_homonym_orthologs()
+    
+    def _index_homonym_orthologs(self):
+        """Index the homonym orthologs of the gold standard annotations per
+        DOI, once for all result sets to map.
+        """
+        self.ho_index = self.gold_standard.homonym_ortholog_index(self.ho_map)
     
     def do_organism_filtering(self, mapping_dict):
         """Set the mapping dictionary for organism filtering, making use of
@@ -40,10 +204,32 @@ class Manager(object):
         """
         self.po_map = mapping_dict
         self._set_hof_containers()
+        self._index_organisms()
+    
+    def _index_organisms(self):
+        """Collect the taxa IDs of the gold standard annotations per DOI,
+        once for all result sets to filter.
+        """
+        self.gs_taxa = self.gold_standard.organism_index(self.po_map)
+    
+    def do_parallel_hof(self, jobs):
+        """Set the number of worker processes to map and filter large result
+        sets with (see PARALLEL_HOF_RESULTS) in subsequent calls to
+        evaluate().
+        
+        The workers are forked from the calling process, which therefore
+        cannot be a worker process itself.
+        """
+        self.hof_jobs = jobs
     
     def _set_hof_containers(self):
         self.GS_Container = map_filter_factory(self.evaluation_type)
         self.Result_Container = map_filter_factory(self.evaluation_type)
+        self.Array_Container = self.Result_Container
+        
+        if not isinstance(self.gold_standard, self.GS_Container):
+            # once: HOF requires the GS in a mapping & filtering container
+            self.gold_standard = self.GS_Container(self.gold_standard)
     
     def evaluate(self, result_iterator, params, debug=False):
         """Evaluate a result set given a data iterator for it using the
@@ -56,20 +242,123 @@ class Manager(object):
         evaluation and returns the GS and results container after HOF
         instead of the primary and secondary evaluation results.
         """
-        # make a copy of the gold standard, as we might delete some of the
-        # annotations it has (related to the skip parameter, see below);
-        # also needed because we actually have the GS in a regular container
-        # always, while we might be doing HOF mapping & filtering
-        gold_standard = self.GS_Container(self.gold_standard)
+        gold_standard, results = self._load_results(
+            result_iterator, params, debug
+        )
+        
+        if debug:
+            return gold_standard, results
+        
+        controller_class = controller_factory(self.evaluation_type)
+        controller = controller_class(params.cutoff, params.min_conf)
+        
+        # ===============================================
+        # ==== The actual evaluation continues here. ====
+        return controller.process(
+            results, gold_standard, self.gold_standard_index
+        )
+        # ===============================================
+    
+    def sweep_cutoffs(self, result_iterator, params):
+        """Evaluate an INT/IPT result set at every cutoff rank in the
+        params.cutoff_sweep list in one pass.
+        
+        Returns the list of SweepPoints (calculation.sweep), ordered by
+        rank; each one has the scores the evaluation with that cutoff would
+        have.
+        """
+        assert self.evaluation_type != Evaluate.ACT, \
+            "ACT evaluations have no cutoff"
+        gold_standard, results = self._load_results(result_iterator, params)
+        controller_class = controller_factory(self.evaluation_type)
+        controller = controller_class(
+            max(params.cutoff_sweep), params.min_conf
+        )
+        controller.cutoff_sweep = params.cutoff_sweep
+        controller.process(results, gold_standard, self.gold_standard_index)
+        return controller.sweep
+    
+    def sweep_min_conf(self, result_iterator, params):
+        """Evaluate an INT/IPT result set at every minimum confidence in the
+        params.min_conf_sweep list (or every distinct confidence if it is
+        empty) in one pass; params.min_conf is not used.
+        
+        Returns the list of SweepPoints (calculation.sweep), ordered by
+        ascending threshold, without Avrg. Precision scores.
+        """
+        assert self.evaluation_type != Evaluate.ACT, \
+            "ACT evaluations have no minimum confidence"
+        gold_standard, results = self._load_results(result_iterator, params)
+        controller_class = controller_factory(self.evaluation_type)
+        controller = controller_class(params.cutoff)
+        controller.min_conf_sweep = params.min_conf_sweep
+        controller.process(results, gold_standard, self.gold_standard_index)
+        return controller.sweep
+    
+    def bootstrap(self, primary, secondary, params, jobs=1):
+        """Return the bootstrap confidence intervals of the scores of an
+        evaluation, i.e., of the primary and secondary evaluation results
+        returned by evaluate(), from params.bootstrap replicates, using up
+        to jobs worker processes.
+        
+        Returns a list of (score name, lower, upper) tuples (see
+        calculation.bootstrap).
+        """
+        Bootstrap = bootstrap_factory(self.evaluation_type)
+        return Bootstrap(primary, secondary).intervals(
+            params.bootstrap, jobs
+        )
+    
+    def compare(self, first, second, params, jobs=1):
+        """Return the p-values of the differences between the scores of two
+        runs evaluated on the same gold standard, i.e., of the primary and
+        secondary evaluation results evaluate() returned for each, from a
+        randomization test with params.shuffles shuffles, using up to jobs
+        worker processes.
+        
+        Returns a list of (score name, first score, second score, p-value)
+        tuples (see calculation.randomization).
+        """
+        Randomization = randomization_factory(self.evaluation_type)
+        return Randomization(first, second).p_values(params.shuffles, jobs)
+    
+    def _hof_jobs_for(self, results):
+        "Return the number of worker processes to map and filter results."
+        if self.hof_jobs < 2 or \
+           (self.ho_map is None and self.po_map is None) or \
+           sum(len(rcl) for rcl in results.values()) < \
+           Manager.PARALLEL_HOF_RESULTS:
+            return 1
+        
+        self.logger.info("mapping and filtering with %i jobs" % self.hof_jobs)
+        return self.hof_jobs
+    
+    def _load_results(self, result_iterator, params, debug=False):
+        """Load the results from the data iterator, doing the HOF, and
+        return a view of the gold standard together with the results, both
+        having the same DOIs.
+        """
+        # use a view of the gold standard, as we might delete some of the
+        # DOIs it has (related to the skip parameter, see below)
+        gold_standard = DataDictView(self.gold_standard)
+        
+        if debug:
+            results = self.Result_Container()
+        else:
+            results = self.Array_Container()
         
-        results = self.Result_Container()
         results.load_from(result_iterator, gold_standard=gold_standard)
+        jobs = self._hof_jobs_for(results)
         
         if self.ho_map is not None:
-            results.map_homonym_orthologs(self.ho_map, gold_standard)
+            results.map_homonym_orthologs(
+                self.ho_map, gold_standard, self.ho_index, jobs
+            )
         
         if self.po_map is not None:
-            results.filter_organisms(self.po_map, gold_standard)
+            results.filter_organisms(
+                self.po_map, gold_standard, self.gs_taxa, jobs
+            )
         
         # remove any DOIs in results that might no longer have annotations
         # because of the mapping or filtering step
@@ -77,21 +366,12 @@ class Manager(object):
         
         # remove DOIs from GS (skip) or add them to results (do not skip)
         if params.skip_empty_results:
-            # here we might be altering the gold standard (copied before)
+            # here we might be restricting the gold standard (view)
             gold_standard.delete_entries_not_in(results)
         else:
             results.add_entries_only_in(gold_standard)
         
-        if debug:
-            return gold_standard, results
-
-        controller_class = controller_factory(self.evaluation_type)
-        controller = controller_class(params.cutoff, params.min_conf)
-        
-        # ===============================================
-        # ==== The actual evaluation continues here. ====
-        return controller.process(results, gold_standard)
-        # ===============================================
+        return gold_standard, results
     
 
         
\ No newline at end of file
@@ -1,5 +1,7 @@
 import logging
 
+from collections import defaultdict
+
 from biocreative.evaluation.map_filter.protein_dict \
     import AbstractProteinDataDict
 
@@ -20,35 +22,50 @@ class INTDataDict(AbstractProteinDataDict):
     # = homonym ortholog mapping =
     # ============================
     
-    def _item_in_ho_map(self, gs_accession):
-        "Return True if the accession is in the HO map."
-        return self._ho_map.has_key(gs_accession)
+    def _ho_index_for(self, ho_map, gs_annotations):
+        """Return the reverse HO map of the GS accessions of a DOI, i.e., the
+        list of GS accessions each HO accession maps to (in GS order),
+        without the HO accessions that are GS accessions themselves.
+        """
+        gs_accessions = set(rc.item for rc in gs_annotations)
+        gs_lists = defaultdict(list)
+        
+        for gs_container in gs_annotations:
+            gs_accession = gs_container.item
+            
+            for ho_accession in ho_map.get(gs_accession, ()):
+                if ho_accession not in gs_accessions:
+                    gs_lists[ho_accession].append(gs_accession)
+        
+        return dict(gs_lists)
     
-    def _item_iterator(self, gs_accession):
-        "see AbstractProteinDataDict._hos_in_results"
-        return self._hos_in_results(gs_accession)
+    def _ho_gs_lists_for(self, doi, gs_annotations, doi_index):
+        """The reverse HO map of the DOI already is the mapping for any
+        results (see _ho_index_for).
+        """
+        return doi_index
     
     # ======================
     # = organism filtering =
     # ======================
     
-    def _organisms_only_in(self, gs_taxa):
+    def _organisms_only_in(self, gs_taxa, result_containers):
         """Organism filtering specifics for INT data.
         
-        Return a filter function that returns True only if the accession
-        in the ResultContainer sent to the function matches an organism ID in
-        the gold standard annotations.
+        Return the list of results where the accession matches an organism
+        ID in the gold standard annotations.
         """
+        org_map = self._org_map
+        new_results = []
         
-        def accession_maps_to_a_gs_taxon(result_container):
-            "Filter function."
+        for result_container in result_containers:
             accession = result_container.item
             
             try:
-                return self._org_map[accession] in gs_taxa
+                if org_map[accession] in gs_taxa:
+                    new_results.append(result_container)
             except KeyError:
                 self.logger.info("unknown accession %s" % accession)
-                return False
         
-        return accession_maps_to_a_gs_taxon
+        return new_results
     
@@ -1,5 +1,7 @@
 import logging
 
+from collections import defaultdict
+
 from biocreative.evaluation.map_filter.protein_dict \
     import AbstractProteinDataDict
 
@@ -26,66 +28,114 @@ class IPTDataDict(AbstractProteinDataDict):
     # = homonym ortholog mapping =
     # ============================
     
-    def _item_in_ho_map(self, gs_pair):
-        "Return True if at least one accession is in the HO map."
-        return any(map(self._ho_map.has_key, gs_pair))
+    def _ho_index_for(self, ho_map, gs_annotations):
+        """Return the GS pairs of a DOI together with a dictionary of the
+        (GS pair number, position) tuples each accession can map to, once
+        per mapping, for the GS pairs with at least one accession in the HO
+        map.
+        
+        An accession maps to a position of a GS pair if it is the GS
+        accession itself or one of its homonym orthologs.
+        """
+        gs_pairs = [rc.item for rc in gs_annotations]
+        positions = defaultdict(list)
+        
+        for number, gs_pair in enumerate(gs_pairs):
+            if not any(acc in ho_map for acc in gs_pair):
+                continue
+            
+            for pos, gs_accession in enumerate(gs_pair):
+                positions[gs_accession].append((number, pos))
+                
+                for ho_accession in ho_map.get(gs_accession, ()):
+                    positions[ho_accession].append((number, pos))
+        
+        return gs_pairs, dict(positions)
     
-    def _item_iterator(self, gs_pair):
-        "Return HO pairs for the GS pair that are also found in the results."
-        acc_lists = self._ho_lists_for_both_gs_accessions(gs_pair)
+    def _ho_gs_lists_for(self, doi, gs_annotations, doi_index):
+        """Return a dictionary of the GS pair lists each HO pair maps to,
+        for the HO pairs found in the results of the DOI.
+        
+        The result pairs are joined with the GS pairs via the positions of
+        their accessions (see _ho_index_for), so only pairs actually in the
+        results are ever looked at. A GS pair is listed as many times as
+        (sorted) pairs of its HO accessions match the result pair.
+        """
+        gs_pairs, positions = doi_index
+        gs_items = set(gs_pairs)
+        ho_gs_lists = {}
+        
+        for result_container in self[doi]:
+            ho_pair = result_container.item
+            
+            if ho_pair in gs_items or ho_pair in ho_gs_lists or \
+               ho_pair[0] > ho_pair[1]:
+                continue # no HO pair, or one that was already joined
+            
+            matches = self._matches_for(ho_pair, positions)
+            
+            if matches:
+                self.logger.debug("-> mapping %s possible" % str(ho_pair))
+                ho_gs_lists[ho_pair] = [
+                    gs_pairs[number] for number in sorted(matches)
+                    for match in xrange(matches[number])
+                ]
         
-        for acc1 in acc_lists[0]:
-            for ho_pair in [[acc1, acc2] for acc2 in acc_lists[1]]:
-                ho_pair.sort()
-                yield tuple(ho_pair)
+        return ho_gs_lists
     
-    def _ho_lists_for_both_gs_accessions(self, gs_pair):
-        """Return the list of HO accessions for both accessions in the GS
-        pair, filtering any accessions that are not also found in the
-        results.
+    @staticmethod
+    def _matches_for(ho_pair, positions):
+        """Return a dictionary of the number of matches of the HO pair per
+        GS pair number.
         """
-        acc_lists = ([], [])
-                
-        for pos in range(2):
-            # report only relevant mappings that can be made (i.e.,
-            # return accessions that are actually part of the results,
-            # reducing the size of pairs we need to check to the possibly
-            # relevant ones only)
-            if gs_pair[pos] in self._ho_map:
-                acc_lists[pos].extend(self._hos_in_results(gs_pair[pos]))
+        counts = [] # per accession of the pair: GS pair number -> [n1, n2]
+        
+        for accession in ho_pair:
+            count = defaultdict(lambda: [0, 0])
             
-            if gs_pair[pos] in self._result_accessions:
-                acc_lists[pos].append(gs_pair[pos])
+            for number, pos in positions.get(accession, ()):
+                count[number][pos] += 1
+            
+            counts.append(count)
+        
+        first, second = counts
+        matches = {}
+        
+        for number in first:
+            if number in second:
+                n = first[number][0] * second[number][1]
+                
+                if ho_pair[0] != ho_pair[1]:
+                    n += second[number][0] * first[number][1]
+                
+                if n:
+                    matches[number] = n
         
-        return acc_lists
+        return matches
     
     # ======================
     # = organism filtering =
     # ======================
     
-    def _organisms_only_in(self, gs_taxa):
-        """Organism filtering specifics for INT data.
+    def _organisms_only_in(self, gs_taxa, result_containers):
+        """Organism filtering specifics for IPT data.
         
-        Return a filter function that returns True only if both accessions
-        in the ResultContainer sent to the function match an organism ID in
-        the gold standard annotations.
+        Return the list of results where both accessions match an organism
+        ID in the gold standard annotations.
         """
+        org_map = self._org_map
+        new_results = []
         
-        def both_accessions_map_to_gs_taxa(result_container):
-            "Filter function."
-            acc_a = result_container.item[0]
-            acc_b = result_container.item[1]
+        for result_container in result_containers:
+            acc_a, acc_b = result_container.item
             
             try:
-                return (
-                    self._org_map[acc_a] in gs_taxa and
-                    self._org_map[acc_b] in gs_taxa
-                )
+                if org_map[acc_a] in gs_taxa and org_map[acc_b] in gs_taxa:
+                    new_results.append(result_container)
             except KeyError:
                 self.logger.debug("unknown accession %s or %s" % (
                     acc_a, acc_b
                 ))
-                return False
         
-        return both_accessions_map_to_gs_taxa
+        return new_results
     
@@ -1,9 +1,27 @@
 import logging
 
-from collections import defaultdict
-
 from biocreative.evaluation.container.protein_dict import ProteinDataDict
 from biocreative.evaluation.container.results import ResultContainer
+from biocreative.evaluation.parallel import fork_map, shared_state
+
+PARTS_PER_JOB = 4 # DOI partitions per worker process of a parallel HOF
+
+def _map_partition(dois):
+    """Return the entries of the changed results and the counters of
+    mapping a partition of the DOIs in a worker process (see
+    map_homonym_orthologs).
+    """
+    results, gold_standard, ho_index = shared_state()
+    return results._map_partition(dois, gold_standard, ho_index)
+
+def _filter_partition(dois):
+    """Return the positions of the results kept and the number of filtered
+    results of a partition of the DOIs in a worker process (see
+    filter_organisms).
+    """
+    results, gold_standard = shared_state()
+    return results._filter_partition(dois, gold_standard)
+
 
 class AbstractProteinDataDict(ProteinDataDict):
     """Data container for INT and IPT data; Common homonym ortholog mapping
@@ -25,11 +43,112 @@ class AbstractProteinDataDict(ProteinDataDict):
     # = Homonym Ortholog Mapping =
     # ============================
     
-    def map_homonym_orthologs(self, homonym_ortholog_map, gold_standard):
-        "Map/replace results that are homonymous orthologs of GS annotations."
+    def homonym_ortholog_index(self, homonym_ortholog_map):
+        """Return the HO index (see _ho_index_for) of each DOI in this (GS)
+        data, to map the results of any number of runs with it.
+        """
+        self.logger.info("indexing homonym ortholog pairs")
+        return dict(
+            (doi, self._ho_index_for(homonym_ortholog_map, gs_annotations))
+            for doi, gs_annotations in self.items()
+        )
+    
+    def map_homonym_orthologs(self, homonym_ortholog_map, gold_standard,
+                              ho_index=None, jobs=1):
+        """Map/replace results that are homonymous orthologs of GS annotations.
+        
+        If the HO index of the GS is given (see homonym_ortholog_index), the
+        DOIs are not indexed again. With more than one job, the DOIs are
+        partitioned across that many worker processes sharing the results,
+        the GS, and the index (see parallel.fork_map), and the counters of
+        all partitions are added up before the totals are checked.
+        """
         self._mapping_setup(homonym_ortholog_map)
+        dois = gold_standard.keys()
+        
+        if jobs > 1:
+            for changed, counters in fork_map(
+                _map_partition, self._partitions(dois, jobs), jobs,
+                (self, gold_standard, ho_index)
+            ):
+                for doi, entries in changed:
+                    self[doi] = self._rebuild(self[doi], entries)
+                
+                self._mapped_results += counters[0]
+                self._added_results += counters[1]
+                self._filtered_results += counters[2]
+        else:
+            self._map_dois(dois, gold_standard, ho_index)
+        
+        self._mapping_logging_and_assertions()
+    
+    @staticmethod
+    def _partitions(dois, jobs):
+        """Return the DOIs split into PARTS_PER_JOB consecutive partitions
+        per job (or one per DOI, if there are fewer DOIs).
+        """
+        parts = min(len(dois), jobs * PARTS_PER_JOB)
+        return [
+            dois[len(dois) * part // parts:len(dois) * (part + 1) // parts]
+            for part in xrange(parts)
+        ]
+    
+    def _map_partition(self, dois, gold_standard, ho_index):
+        """Map the results of the DOIs, returning the list of (DOI, entries)
+        pairs of the DOIs that changed (see _rebuild) and the (mapped,
+        added, filtered) counters.
+        """
+        self._mapped_results = 0
+        self._added_results = 0
+        self._filtered_results = 0
+        old_items = dict(
+            (doi, [rc.item for rc in self[doi]]) for doi in dois if doi in self
+        )
+        old_results = dict((doi, self[doi]) for doi in old_items)
+        self._map_dois(dois, gold_standard, ho_index)
+        changed = []
         
-        for doi, gs_annotations in gold_standard.items():
+        for doi, result_containers in old_results.items():
+            if self[doi] is result_containers:
+                continue # nothing mapped
+            
+            positions = dict(
+                (id(rc), i) for i, rc in enumerate(result_containers)
+            )
+            entries = []
+            
+            for rc in self[doi]:
+                i = positions.get(id(rc))
+                
+                if i is not None and rc.item == old_items[doi][i]:
+                    entries.append(i)
+                else:
+                    entries.append((rc.item, rc.confidence))
+            
+            changed.append((doi, entries))
+        
+        return changed, (
+            self._mapped_results, self._added_results, self._filtered_results
+        )
+    
+    def _rebuild(self, result_containers, entries):
+        """Return the mapped results of a DOI given the result containers
+        before the mapping and the entries of the mapped results.
+        
+        An entry is the position of an unchanged result, or the (item,
+        confidence) of a mapped result; sending these from the worker
+        processes is much faster than sending the results themselves.
+        """
+        new_results = [
+            result_containers[entry] if type(entry) is int else
+            ResultContainer(entry[0], None, entry[1]) for entry in entries
+        ]
+        self._rerank_results(new_results)
+        return new_results
+    
+    def _map_dois(self, dois, gold_standard, ho_index):
+        "Map the results of the DOIs (see map_homonym_orthologs)."
+        for doi in dois:
             if doi not in self or len(self[doi]) == 0:
                 self.logger.debug(
                     "skipping DOI '%s' not in results (or len 0)" % doi
@@ -37,17 +156,33 @@ class AbstractProteinDataDict(ProteinDataDict):
                 continue # no need to map empty/nonexistent results...
             
             self.logger.debug("homonym ortholog mapping for DOI '%s'" % doi)
-            self._ho_gs_lists = defaultdict(list)
-            self._result_accessions = self.extract_accessions_for(doi)
-            self._gs_items = [rc.item for rc in gs_annotations]
+            gs_annotations = gold_standard[doi]
             
-            for gs_container in gs_annotations:
-                gs_item = gs_container.item
-                self._add_ho_gs_mappings_for(gs_item)
+            if ho_index is None:
+                doi_index = self._ho_index_for(self._ho_map, gs_annotations)
+            else:
+                doi_index = ho_index[doi]
             
+            self._ho_gs_lists = self._ho_gs_lists_for(
+                doi, gs_annotations, doi_index
+            )
             self[doi] = self._map(doi)
+    
+    def _ho_index_for(self, ho_map, gs_annotations):
+        """Return the HO index of the GS annotations of a DOI, independent of
+        the results.
         
-        self._mapping_logging_and_assertions()
+        Abstract method.
+        """
+        raise NotImplementedError("abstract")
+    
+    def _ho_gs_lists_for(self, doi, gs_annotations, doi_index):
+        """Return a dictionary of the GS item lists each HO result item of
+        the DOI maps to, given the HO index of the DOI.
+        
+        Abstract method.
+        """
+        raise NotImplementedError("abstract")
     
     def _mapping_setup(self, ho_map):
         "Initialize all instance variables for the HO mapping operation."
@@ -57,126 +192,90 @@ class AbstractProteinDataDict(ProteinDataDict):
         self._added_results = 0
         self._filtered_results = 0
         self._ho_gs_lists = None
-        self._result_accessions = None
-        self._gs_items = None
         self._result_container = None
         self._replaced_an_entry = False
         self._old_results_size = sum(len(rcl) for rcl in self.values())
     
-    def _add_ho_gs_mappings_for(self, gs_item):
-        """Find homonym ortholog mapping for this GS item.
-        
-        Adds homonym ortholog and gold standard items to the current
-        HO GS dictionary list if there is a known mapping for the gold
-        standard item, but only adds HO items if their accessions are also
-        found in the results.
-        """
-        if self._item_in_ho_map(gs_item):
-            self.logger.debug("searching HO for GS item %s" % str(gs_item))
-            for ho_item in self._item_iterator(gs_item):
-                if ho_item not in self._gs_items:
-                    self.logger.debug(
-                        "-> mapping to %s possible" % str(ho_item)
-                    )
-                    self._ho_gs_lists[ho_item].append(gs_item)
-    
-    def _item_in_ho_map(self, gs_item):
-        """Return True if any accession is in the HO map.
-        
-        Abstract method.
-        """
-        raise NotImplementedError("abstract")
-    
-    def _item_iterator(self, gs_item):
-        """Return HO items for this GS item.
-        
-        Abstract method.
-        """
-        raise NotImplementedError("abstract")
-    
     def _map(self, doi):
         """Map/replace HO results with GS items and remove any duplicate
-        results generated in the process.
+        results generated in the process (returning the same list if no
+        result was mapped).
         """
         self._replaced_an_entry = False
-        new_results = list(self[doi])
-        old_results = list(new_results)
-        old_results.reverse()
-        map(self._map_replace(new_results), enumerate(old_results))
+        new_results = self._map_replace(self[doi])
         
-        if self._replaced_an_entry:
-            new_results = self._remove_duplicates(new_results)
-            self._rerank_results(new_results)
+        if not self._replaced_an_entry:
+            return self[doi] # nothing mapped
         
+        new_results = self._remove_duplicates(new_results)
+        self._rerank_results(new_results)
         return new_results
     
-    def _map_replace(self, new_results):
-        "Map between the new and old result list and replace HO matches."
-        len_r = len(new_results)
+    def _map_replace(self, result_containers):
+        """Return a new list of the results where the HO matches are
+        replaced with their GS items, in one pass over the results.
+        """
+        new_results = []
         
-        def mapper(indexed_result_container):
-            "Mapping function."
-            self._result_container = indexed_result_container[1]
-            pos = len_r - indexed_result_container[0] - 1
-            
-            if new_results[pos].item != self._result_container.item:
-                raise IndexError("in homonym ortholog mapping algorithm")
-            
-            if self._result_container.item in self._ho_gs_lists:
-                self._replace(new_results, pos)
+        for result_container in result_containers:
+            if result_container.item in self._ho_gs_lists:
+                self._result_container = result_container
+                self._replace(new_results)
+            else:
+                new_results.append(result_container)
         
-        return mapper
-
-    def _replace(self, new_results, pos):
-        "Replace the result item with the HO mapped GS result."
+        return new_results
+    
+    def _replace(self, new_results):
+        "Append the HO mapped GS result(s) of the result item."
         self._replaced_an_entry = True
         result_item = self._result_container.item
         gs_items = self._ho_gs_lists[result_item]
         
         if len(gs_items) > 1:
-            self._replace_multiple(new_results, gs_items, pos)
+            self._replace_multiple(new_results, gs_items)
         else:
             self.logger.debug("=! mapping %s to GS item %s" % (
-                str(new_results[pos].item), str(gs_items[0])
+                str(result_item), str(gs_items[0])
             ))
-            new_results[pos].item = gs_items[0]
+            self._result_container.item = gs_items[0]
+            new_results.append(self._result_container)
             self._mapped_results += 1
     
-    def _replace_multiple(self, new_results, gs_items, pos):
-        "Add all possible HO mappings of GS items for this result item."
+    def _replace_multiple(self, new_results, gs_items):
+        """Append all possible HO mappings of GS items for this result item
+        instead of it, the last GS item first.
+        """
         conf = self._result_container.confidence
         rank = self._result_container.rank
         
-        for item in gs_items:
+        for item in reversed(gs_items):
             self.logger.debug("=! mapping %s to GS item %s" % (
-                str(new_results[pos].item), str(item)
+                str(self._result_container.item), str(item)
             ))
-            new_results.insert(
-                pos + 1, ResultContainer(item, rank, conf)
-            )
+            new_results.append(ResultContainer(item, rank, conf))
             self._added_results += 1
         
-        del new_results[pos]
         self._filtered_results += 1
     
     def _remove_duplicates(self, result_containers):
         """Remove eventual duplicates added to the results in the mapping
-        process.
+        process, keeping the first (highest ranked) result of each item.
         """
-        new_result_containers = list(result_containers)
-        original_items = [rc.item for rc in result_containers]
-        pos = len(original_items)
+        new_result_containers = []
+        seen_items = set()
         
-        while pos > 0:
-            pos -= 1
-            item = original_items.pop()
+        for result_container in result_containers:
+            item = result_container.item
             
-            if item in original_items:
+            if item in seen_items:
                 self.logger.debug("=! filtering duplicate item %s" % (
-                    str(new_result_containers[pos].item)
+                    str(item)
                 ))
-                del new_result_containers[pos]
                 self._filtered_results += 1
+            else:
+                seen_items.add(item)
+                new_result_containers.append(result_container)
         
         return new_result_containers
     
@@ -202,31 +301,96 @@ class AbstractProteinDataDict(ProteinDataDict):
         assert new_results_size - change == self._old_results_size, \
             "result size changes do not match control"
     
-    def _hos_in_results(self, gs_accession):
-        """Return all HO accessions that are also found in the results
-        for the given GS accession.
-        """
-        return filter(
-            lambda acc: acc in self._result_accessions,
-            self._ho_map[gs_accession]
-        )
-    
     # ======================
     # = Organism Filtering =
     # ======================
     
-    def filter_organisms(self, organism_map, gold_standard):
-        "Filter wrong organisms from the results according to the GS."
+    def organism_index(self, organism_map):
+        """Return the set of taxa IDs of the GS annotations of each DOI in
+        this (GS) data, to filter the results of any number of runs with it.
+        
+        DOIs with GS accessions missing in the organism map are set to None,
+        so the error is only raised if there are results to filter for them.
+        """
+        self.logger.info("indexing GS organisms")
+        gs_taxa = {}
+        
+        for doi in self.keys():
+            try:
+                gs_taxa[doi] = self._taxa_of(
+                    organism_map, self.extract_accessions_for(doi)
+                )
+            except KeyError:
+                gs_taxa[doi] = None
+        
+        return gs_taxa
+    
+    def filter_organisms(self, organism_map, gold_standard, gs_taxa=None,
+                         jobs=1):
+        """Filter wrong organisms from the results according to the GS.
+        
+        If the GS taxa of each DOI are given (see organism_index), they are
+        not looked up again. With more than one job, the DOIs are filtered
+        in parallel, as the HO mapping (see map_homonym_orthologs).
+        """
         self.logger.info("organism filtering")
         self._org_map = organism_map
         self._filtered = 0
         self._gold_standard = gold_standard
+        self._gs_taxa = gs_taxa
+        dois = gold_standard.keys()
         
-        for doi, gs_container in gold_standard.items():
-            self[doi] = self._filter_organisms(doi, gs_container)
+        if jobs > 1:
+            for kept, filtered in fork_map(
+                _filter_partition, self._partitions(dois, jobs), jobs,
+                (self, gold_standard)
+            ):
+                for doi, positions in kept:
+                    result_containers = self.get(doi, [])
+                    self[doi] = [result_containers[i] for i in positions]
+                
+                self._filtered += filtered
+        else:
+            self._filter_dois(dois, gold_standard)
         
         self.logger.info("%i results were filtered" % self._filtered)
     
+    def _filter_partition(self, dois, gold_standard):
+        """Filter the results of the DOIs, returning the list of (DOI,
+        positions of the results kept) pairs of the DOIs that changed and
+        the number of filtered results.
+        
+        Only the positions are returned, as the results themselves do not
+        change and are already known to the calling process.
+        """
+        self._filtered = 0
+        old_results = dict((doi, self[doi]) for doi in dois if doi in self)
+        self._filter_dois(dois, gold_standard)
+        kept = []
+        
+        for doi in dois:
+            if doi in old_results and \
+               len(self[doi]) == len(old_results[doi]):
+                continue # nothing filtered
+            
+            new_results = iter(self[doi])
+            result_container = next(new_results, None)
+            positions = []
+            
+            for i, old_container in enumerate(old_results.get(doi, ())):
+                if old_container is result_container:
+                    positions.append(i)
+                    result_container = next(new_results, None)
+            
+            kept.append((doi, positions))
+        
+        return kept, self._filtered
+    
+    def _filter_dois(self, dois, gold_standard):
+        "Filter the results of the DOIs (see filter_organisms)."
+        for doi in dois:
+            self[doi] = self._filter_organisms(doi, gold_standard[doi])
+    
     def _filter_organisms(self, doi, gs_container):
         """Filter results where the source organisms of the accessions does
         not match the source organism of the gold standard accessions.
@@ -234,11 +398,13 @@ class AbstractProteinDataDict(ProteinDataDict):
         if doi not in self or len(self[doi]) == 0:
             return list() # no need to filter empty/non-existent results...
         
-        gs_taxa = self._get_gs_taxa_for(doi)
+        if self._gs_taxa is None or self._gs_taxa[doi] is None:
+            gs_taxa = self._get_gs_taxa_for(doi)
+        else:
+            gs_taxa = self._gs_taxa[doi]
+        
         from_old_results = self[doi]
-        new_results = filter(
-            self._organisms_only_in(gs_taxa), from_old_results
-        )
+        new_results = self._organisms_only_in(gs_taxa, from_old_results)
         self._filtered += (len(from_old_results) - len(new_results))
         return new_results
     
@@ -247,16 +413,20 @@ class AbstractProteinDataDict(ProteinDataDict):
         gs_accessions = self._gold_standard.extract_accessions_for(doi)
         
         try:
-            return set([self._org_map[acc] for acc in gs_accessions])
+            return self._taxa_of(self._org_map, gs_accessions)
         except KeyError, e:
             raise RuntimeError(
                 "Missing GS accession in organism map: %s" % str(e)
             )
     
-    def _organisms_only_in(self, gs_taxa):
-        """Return a filter function that returns True only if the accessions
-        in the ResultContainer sent to the function matches organism IDs in
-        the gold standard annotations.
+    @staticmethod
+    def _taxa_of(organism_map, accessions):
+        "Return the set of taxa IDs of the accessions."
+        return set([organism_map[acc] for acc in accessions])
+    
+    def _organisms_only_in(self, gs_taxa, result_containers):
+        """Return the list of results where the accessions match organism
+        IDs in the gold standard annotations.
         
         Abstract method.
         """
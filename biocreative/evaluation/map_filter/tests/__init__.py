@@ -63,6 +63,13 @@ class MapFilterTests(unittest.TestCase):
         self.results.map_homonym_orthologs(self.ho_map, self.gs)
         self.assert_results(self.expected_ho_results)
     
+    def test_int_homonym_ortholog_mapping_with_index(self):
+        self.set_up_INT()
+        self.results.map_homonym_orthologs(
+            self.ho_map, self.gs, self.gs.homonym_ortholog_index(self.ho_map)
+        )
+        self.assert_results(self.expected_ho_results)
+    
     def test_int_organism_filtering(self):
         self.set_up_INT()
         self.results.map_homonym_orthologs(self.ho_map, self.gs)
@@ -70,6 +77,37 @@ class MapFilterTests(unittest.TestCase):
         self.assert_results(self.expected_of_results)
         
     
+    def test_int_organism_filtering_with_index(self):
+        self.set_up_INT()
+        self.results.map_homonym_orthologs(self.ho_map, self.gs)
+        self.results.filter_organisms(
+            self.tax_map, self.gs, self.gs.organism_index(self.tax_map)
+        )
+        self.assert_results(self.expected_of_results)
+    
+    def test_int_mapping_and_filtering_in_parallel(self):
+        self.set_up_INT()
+        self.results.map_homonym_orthologs(self.ho_map, self.gs, jobs=2)
+        self.assert_results(self.expected_ho_results)
+        self.assertEqual(
+            (self.results._mapped_results, self.results._added_results,
+             self.results._filtered_results), (5, 4, 4)
+        )
+        self.results.filter_organisms(self.tax_map, self.gs, jobs=2)
+        self.assert_results(self.expected_of_results)
+        self.assertEqual(self.results._filtered, 3)
+    
+    def test_int_organism_filtering_missing_gs_accession(self):
+        self.set_up_INT()
+        del self.tax_map['H4']
+        gs_taxa = self.gs.organism_index(self.tax_map)
+        self.assertEqual(gs_taxa[0], set(['H']))
+        self.assertEqual(gs_taxa[1], None)
+        self.assertRaises(
+            RuntimeError, self.results.filter_organisms, self.tax_map,
+            self.gs, gs_taxa
+        )
+    
     def set_up_IPT(self):
         self.gs = IPTDataDict(enumerate([
             [RC(('H1', 'H2')), RC(('H1', 'H3'))],
@@ -120,12 +158,40 @@ class MapFilterTests(unittest.TestCase):
         self.results.map_homonym_orthologs(self.ho_map, self.gs)
         self.assert_results(self.expected_ho_results)
     
+    def test_ipt_homonym_ortholog_mapping_with_index(self):
+        self.set_up_IPT()
+        self.results.map_homonym_orthologs(
+            self.ho_map, self.gs, self.gs.homonym_ortholog_index(self.ho_map)
+        )
+        self.assert_results(self.expected_ho_results)
+    
     def test_ipt_organism_filtering(self):
         self.set_up_IPT()
         self.results.map_homonym_orthologs(self.ho_map, self.gs)
         self.results.filter_organisms(self.tax_map, self.gs)
         self.assert_results(self.expected_of_results)
     
+    def test_ipt_organism_filtering_with_index(self):
+        self.set_up_IPT()
+        self.results.map_homonym_orthologs(self.ho_map, self.gs)
+        self.results.filter_organisms(
+            self.tax_map, self.gs, self.gs.organism_index(self.tax_map)
+        )
+        self.assert_results(self.expected_of_results)
+    
+    def test_ipt_mapping_and_filtering_in_parallel(self):
+        self.set_up_IPT()
+        self.results.map_homonym_orthologs(
+            self.ho_map, self.gs, self.gs.homonym_ortholog_index(self.ho_map),
+            jobs=3
+        )
+        self.assert_results(self.expected_ho_results)
+        self.results.filter_organisms(
+            self.tax_map, self.gs, self.gs.organism_index(self.tax_map),
+            jobs=3
+        )
+        self.assert_results(self.expected_of_results)
+    
     def assert_results(self, expected_results):
         for doi, expected in expected_results:
             items = [rc.item for rc in self.results[doi]]
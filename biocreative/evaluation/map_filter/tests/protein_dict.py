@@ -14,26 +14,58 @@ class AbstractProteinDataDictTest(unittest.TestCase):
     def test_init_state(self):
         pass
     
+    def test_homonym_ortholog_index(self):
+        self.data._ho_index_for = Mock()
+        self.data._ho_index_for.return_value = sentinel.doi_index
+        self.data.update({ 1: ['a'], 2: ['b', 'c'] })
+        ho_index = self.data.homonym_ortholog_index(sentinel.ho_map)
+        self.assertEqual(
+            ho_index, { 1: sentinel.doi_index, 2: sentinel.doi_index }
+        )
+        self.assert_called_with(self.data._ho_index_for, [
+            ((sentinel.ho_map, ['a']), {}),
+            ((sentinel.ho_map, ['b', 'c']), {})
+        ])
+    
     def test_map_homonym_orthologs(self):
         self.data._mapping_setup = Mock()
-        self.data.extract_accessions_for = Mock()
-        self.data._add_ho_gs_mappings_for = Mock()
+        self.data._ho_map = sentinel.ho_map
+        self.data._ho_index_for = Mock()
+        self.data._ho_index_for.return_value = sentinel.doi_index
+        self.data._ho_gs_lists_for = Mock()
+        self.data._ho_gs_lists_for.return_value = sentinel.ho_gs_lists
         self.data._map = Mock()
         self.data._mapping_logging_and_assertions = Mock()
-        rc1 = Mock(spec=ResultContainer)
-        rc1.item = 'a'
-        rc2 = Mock(spec=ResultContainer)
-        rc2.item = 'b'
-        gs = { 1: [rc1, rc2], 2: None, 3: None }
-        self.data[1] = [rc1, rc2]
+        gs = { 1: sentinel.gs_annotations, 2: None, 3: None }
+        self.data[1] = ['a', 'b']
         self.data[2] = []
         self.data.map_homonym_orthologs(sentinel.ho_map, gs)
         self.assert_called_once(self.data._mapping_setup, sentinel.ho_map)
         self.assert_called_once(self.data._mapping_logging_and_assertions)
         self.assert_called_once(self.data._map, 1)
-        self.assert_called_once(self.data.extract_accessions_for, 1)
-        self.assert_called_with(
-            self.data._add_ho_gs_mappings_for, [(('a',), {}), (('b',), {})]
+        self.assert_called_once(
+            self.data._ho_index_for, sentinel.ho_map, sentinel.gs_annotations
+        )
+        self.assert_called_once(
+            self.data._ho_gs_lists_for, 1, sentinel.gs_annotations,
+            sentinel.doi_index
+        )
+        self.assertEqual(self.data._ho_gs_lists, sentinel.ho_gs_lists)
+    
+    def test_map_homonym_orthologs_with_index(self):
+        self.data._ho_index_for = Mock()
+        self.data._ho_gs_lists_for = Mock()
+        self.data._map = Mock()
+        self.data._mapping_logging_and_assertions = Mock()
+        self.data[1] = ['a', 'b']
+        self.data.map_homonym_orthologs(
+            sentinel.ho_map, { 1: sentinel.gs_annotations },
+            { 1: sentinel.doi_index }
+        )
+        self.assertEqual(self.data._ho_index_for.call_count, 0)
+        self.assert_called_once(
+            self.data._ho_gs_lists_for, 1, sentinel.gs_annotations,
+            sentinel.doi_index
         )
     
     def test_mapping_setup(self):
@@ -44,31 +76,17 @@ class AbstractProteinDataDictTest(unittest.TestCase):
         self.assertEqual(self.data._added_results, 0)
         self.assertEqual(self.data._filtered_results, 0)
         self.assertEqual(self.data._ho_gs_lists, None)
-        self.assertEqual(self.data._result_accessions, None)
         self.assertEqual(self.data._result_container, None)
         self.assertEqual(self.data._replaced_an_entry, False)
         self.assertEqual(self.data._old_results_size, 4)
     
-    def test_add_ho_gs_mappings_for(self):
-        self.data._item_in_ho_map = Mock()
-        self.data._item_in_ho_map.return_value = True
-        self.data._item_iterator = Mock()
-        self.data._item_iterator.return_value = [1, 2, 3]
-        self.data._ho_gs_lists = { 1: [], 2: [], 3: [] }
-        self.data._gs_items = [1]
-        self.data._add_ho_gs_mappings_for('a')
-        self.assert_called_once(self.data._item_in_ho_map, 'a')
-        self.assert_called_once(self.data._item_iterator, 'a')
-        self.assertEqual(
-            self.data._ho_gs_lists, { 1: [], 2: ['a'], 3: ['a'] }
-        )
-    
     def test_map(self):
         self.data[1] = ['a', 'b', 'c']
         self.data._map_replace = Mock()
         
-        def set_flag(result_container):
+        def set_flag(result_containers):
             self.data._replaced_an_entry = True
+            return list(result_containers)
         
         self.data._map_replace.side_effect = set_flag
         self.data._remove_duplicates = Mock()
@@ -87,6 +105,58 @@ class AbstractProteinDataDictTest(unittest.TestCase):
             self.data._rerank_results, sentinel.new_results
         )
     
+    def test_map_replace(self):
+        rc_list = [
+            ResultContainer('a', 1, 0.9), ResultContainer('b', 2, 0.8),
+            ResultContainer('c', 3, 0.7), ResultContainer('d', 4, 0.6)
+        ]
+        self.data._mapping_setup({})
+        self.data._ho_gs_lists = { 'b': ['B'], 'c': ['C1', 'C2'] }
+        new_results = self.data._map_replace(rc_list)
+        self.assertEqual(
+            [(rc.item, rc.rank) for rc in new_results],
+            [('a', 1), ('B', 2), ('C2', 3), ('C1', 3), ('d', 4)]
+        )
+        self.assertTrue(new_results[1] is rc_list[1])
+        self.assertEqual(self.data._replaced_an_entry, True)
+        self.assertEqual(self.data._mapped_results, 1)
+        self.assertEqual(self.data._added_results, 2)
+        self.assertEqual(self.data._filtered_results, 1)
+    
+    def test_remove_duplicates(self):
+        self.data._mapping_setup({})
+        rc_list = [
+            ResultContainer(item, rank, None)
+            for rank, item in enumerate(['a', 'b', 'a', 'c', 'b', 'a'])
+        ]
+        new_results = self.data._remove_duplicates(rc_list)
+        self.assertEqual(
+            [(rc.item, rc.rank) for rc in new_results],
+            [('a', 0), ('b', 1), ('c', 3)]
+        )
+        self.assertEqual(self.data._filtered_results, 3)
+    
+    def test_partitions(self):
+        dois = range(10)
+        partitions = AbstractProteinDataDict._partitions(dois, 2)
+        self.assertEqual(len(partitions), 8)
+        self.assertEqual(sum(partitions, []), dois)
+        self.assertEqual(
+            AbstractProteinDataDict._partitions([1, 2], 4), [[1], [2]]
+        )
+    
+    def test_rebuild(self):
+        rc_list = [
+            ResultContainer('a', 1, 0.9), ResultContainer('b', 2, 0.8),
+            ResultContainer('c', 3, 0.7)
+        ]
+        new_results = self.data._rebuild(rc_list, [0, ('B', 0.8), 2])
+        self.assertEqual(
+            [(rc.item, rc.rank, rc.confidence) for rc in new_results],
+            [('a', 1, 0.9), ('B', 2, 0.8), ('c', 3, 0.7)]
+        )
+        self.assertTrue(new_results[0] is rc_list[0])
+    
     def assert_called_once(self, mock, *args, **kwds):
         self.assertEqual(mock.call_count, 1)
         self.assert_called_with(mock, [(args, kwds)])
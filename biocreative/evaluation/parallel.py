@@ -0,0 +1,51 @@
+# encoding: utf-8
+"""parallel
+
+Map a function over work items using forked worker processes that share
+the (read-only) state of the parent process copy-on-write, instead of
+pickling it for each task.
+"""
+
+import logging
+import os
+
+_shared_state = None
+
+def shared_state():
+    "Return the state given to the currently running fork_map()."
+    return _shared_state
+
+def fork_map(function, items, jobs, state=None):
+    """Yield function(item) for all items, in the order of the items.
+    
+    The work is done by up to jobs worker processes; the function and the
+    items must be picklable, while the state is made available to the
+    function through shared_state() without pickling it (the workers are
+    forked after setting it). If jobs is less than two or the OS cannot
+    fork, the items are processed in this process (and the state given
+    to an enclosing fork_map() is restored afterwards).
+    """
+    global _shared_state
+    enclosing_state = _shared_state
+    _shared_state = state
+    
+    try:
+        if jobs < 2 or not hasattr(os, 'fork'):
+            for item in items:
+                yield function(item)
+        else:
+            import multiprocessing
+            logging.info("starting %i worker processes" % jobs)
+            pool = multiprocessing.Pool(jobs)
+            
+            try:
+                for result in pool.imap(function, items):
+                    yield result
+                
+                pool.close()
+            finally:
+                pool.terminate()
+                pool.join()
+    finally:
+        _shared_state = enclosing_state
+    
\ No newline at end of file
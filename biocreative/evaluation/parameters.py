@@ -12,12 +12,62 @@ class Parameters(object):
         self.evaluation_type = Evaluate.check_type(opts.EVALUATION_TYPE)
         self.cutoff = int(opts.CUTOFF_AT_RANK)
         self.min_conf = opts.MIN_CONF
+        self.cutoff_sweep = Parameters.parse_cutoffs(opts.CUTOFF_SWEEP)
+        self.min_conf_sweep = Parameters.parse_thresholds(
+            opts.MIN_CONF_SWEEP
+        )
+        self.bootstrap = int(opts.BOOTSTRAP)
+        self.shuffles = int(opts.SHUFFLES)
         
         # flags
         self.plot_result = bool(opts.PLOT_RESULT)
         self.skip_empty_results = bool(opts.SKIP_EMPTY_RESULTS)
         self.set_result_order(int(opts.RESULT_ORDER))
     
+    @staticmethod
+    def parse_cutoffs(value):
+        """Return the sorted list of the cutoff ranks given as a comma-
+        separated list of ranks and "first..last" ranges (or None).
+        
+        Raises a ValueError if a rank is not an integer > 0.
+        """
+        if value is None:
+            return None
+        
+        cutoffs = set()
+        
+        for part in value.split(','):
+            if '..' in part:
+                first, last = part.split('..', 1)
+                cutoffs.update(range(int(first), int(last) + 1))
+            else:
+                cutoffs.add(int(part))
+        
+        if not cutoffs or min(cutoffs) < 1:
+            raise ValueError("illegal cutoff ranks '%s'" % value)
+        
+        return sorted(cutoffs)
+    
+    @staticmethod
+    def parse_thresholds(value):
+        """Return the sorted list of the minimum confidences given as a
+        comma-separated list, an empty list for "all" (every distinct
+        confidence), or None.
+        
+        Raises a ValueError if a confidence is not in the range [0..1].
+        """
+        if value is None:
+            return None
+        elif value == 'all':
+            return []
+        
+        thresholds = sorted(set(float(part) for part in value.split(',')))
+        
+        if thresholds[0] < 0.0 or thresholds[-1] > 1.0:
+            raise ValueError("illegal minimum confidences '%s'" % value)
+        
+        return thresholds
+    
     def set_result_order(self, result_order):
         "Determine the ordering employed on the results given the parameters."
         self.result_order = result_order
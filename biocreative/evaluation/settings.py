@@ -22,7 +22,13 @@ class Defaults(object):
     # the result file - or, vice versa, absent in the file if not given
     CUTOFF_AT_RANK = 0 # 0 for no cutoff
     MIN_CONF = 0.0 # minimum confidence cutoff
+    CUTOFF_SWEEP = None # e.g., "1..10": evaluate at all these cutoffs
+    MIN_CONF_SWEEP = None # e.g., "0.1,0.5" or "all" (distinct confidences)
+    BOOTSTRAP = 0 # replicates for the confidence intervals; 0 for none
+    SHUFFLES = 10000 # shuffles of the randomization test comparing runs
     FIELD_SEPARATOR = '\t' # cannot be changed on the CL
+    BATCH_SIZE = 1 << 20 # bytes per block read by the result batch readers
+    JOBS = 1 # worker processes evaluating the result files
     CONFIG_FILE = p.join(p.dirname(p.abspath(__file__)), 'configuration.ini')
 
 class Evaluate(object):
@@ -0,0 +1,78 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from biocreative.evaluation.file_io.readers import GoldINTReader
+from biocreative.evaluation.file_io.store import Files
+from biocreative.evaluation.manager import Manager
+from biocreative.evaluation.settings import Evaluate
+
+GS_DATA = "doi1\tP00001\ndoi1\tP00002\ndoi2\tP00003\n"
+
+class ManagerTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.tmp_dir, 'cache')
+        self.manager = Manager(Evaluate.INT)
+    
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+    
+    def gs_reader(self, path):
+        return GoldINTReader(Files.File(path), '\t')
+    
+    def write_gs(self, path):
+        fh = open(path, 'w')
+        fh.write(GS_DATA)
+        fh.close()
+    
+    def test_init_state(self):
+        self.assertEqual(self.manager.evaluation_type, Evaluate.INT)
+        self.assertEqual(self.manager.cache_dir, None)
+        self.assertEqual(self.manager.ho_map, None)
+        self.assertEqual(self.manager.po_map, None)
+        self.assertEqual(self.manager.hof_jobs, 1)
+    
+    def test_gold_standard_cache_file(self):
+        gs_path = os.path.join(self.tmp_dir, 'gs.tsv')
+        self.write_gs(gs_path)
+        self.assertEqual(
+            self.manager._gold_standard_cache_file(self.gs_reader(gs_path)),
+            None
+        )
+        self.manager.cache_gold_standard_in(self.cache_dir)
+        cache_file = self.manager._gold_standard_cache_file(
+            self.gs_reader(gs_path)
+        )
+        self.assertEqual(os.path.dirname(cache_file), self.cache_dir)
+        self.manager.load_gold_standard(self.gs_reader(gs_path))
+        self.assertTrue(os.path.exists(cache_file))
+        self.assertEqual(sorted(self.manager.gold_standard.keys()),
+                         ['doi1', 'doi2'])
+    
+    def test_no_cache_file_for_streams(self):
+        if not hasattr(os, 'mkfifo'):
+            return
+        
+        fifo_path = os.path.join(self.tmp_dir, 'gs.fifo')
+        os.mkfifo(fifo_path)
+        self.manager.cache_gold_standard_in(self.cache_dir)
+        self.assertEqual(
+            self.manager._gold_standard_cache_file(self.gs_reader(fifo_path)),
+            None
+        )
+        writer = threading.Thread(target=self.write_gs, args=(fifo_path,))
+        writer.setDaemon(True)
+        writer.start()
+        self.manager.load_gold_standard(self.gs_reader(fifo_path))
+        writer.join()
+        self.assertEqual(sorted(self.manager.gold_standard.keys()),
+                         ['doi1', 'doi2'])
+        self.assertFalse(os.path.exists(self.cache_dir))
+    
+
+if __name__ == '__main__':
+    unittest.main()
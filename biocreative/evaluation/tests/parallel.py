@@ -0,0 +1,61 @@
+import unittest
+
+from biocreative.evaluation.parallel import fork_map, shared_state
+
+def square(item):
+    return item * item
+
+def add_state(item):
+    return item + shared_state()
+
+def nested_serial_map(item):
+    inner = list(fork_map(add_state, [item], 1, 100))
+    return inner + [shared_state()]
+
+def fail_on_three(item):
+    if item == 3:
+        raise ValueError("item %i" % item)
+    
+    return item
+
+
+class fork_mapTest(unittest.TestCase):
+    
+    def test_order_serial(self):
+        self.assertEqual(
+            list(fork_map(square, range(10), 1)), [i * i for i in range(10)]
+        )
+    
+    def test_order_parallel(self):
+        self.assertEqual(
+            list(fork_map(square, range(50), 3)), [i * i for i in range(50)]
+        )
+    
+    def test_shared_state_serial(self):
+        self.assertEqual(list(fork_map(add_state, [1, 2], 1, 10)), [11, 12])
+        self.assertEqual(shared_state(), None)
+    
+    def test_shared_state_parallel(self):
+        self.assertEqual(
+            list(fork_map(add_state, range(5), 2, 10)), range(10, 15)
+        )
+        self.assertEqual(shared_state(), None)
+    
+    def test_nested_serial_map_restores_the_state(self):
+        for jobs in (1, 2):
+            self.assertEqual(
+                list(fork_map(nested_serial_map, [1, 2], jobs, 10)),
+                [[101, 10], [102, 10]]
+            )
+            self.assertEqual(shared_state(), None)
+    
+    def test_worker_errors_reach_the_caller(self):
+        for jobs in (1, 2):
+            self.assertRaises(
+                ValueError, list, fork_map(fail_on_three, range(5), jobs, 0)
+            )
+            self.assertEqual(shared_state(), None)
+    
+
+if __name__ == '__main__':
+    unittest.main()